@@ -2,4 +2,12 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'api'
\ No newline at end of file
+    name = 'api'
+
+    def ready(self):
+        # api.job and api.user are not separate installed apps, so their signals are wired up here
+        import api.job.signals  # noqa: F401
+        import api.user.signals  # noqa: F401
+        from django.db.backends.signals import connection_created
+        from .timing import install_db_timer
+        connection_created.connect(install_db_timer, dispatch_uid='api.timing.install_db_timer')
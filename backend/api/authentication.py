@@ -0,0 +1,107 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from api.job.response_cache import bump_generation, current_generation
+from api.lru_cache import LRUCache
+
+# Authenticated users are cached per process, keyed by user id, so a request with
+# a valid access token usually needs no query to load request.user. Saving or
+# deleting a user drops that user's entry in the process that made the change
+# and bumps the 'users' cache generation; other processes only use an entry while
+# the generation it was loaded under is current.
+USERS = 'users'
+# How long a process trusts its last read of the 'users' generation
+GENERATION_TTL = float(getattr(settings, 'AUTH_USER_GENERATION_TTL', 1.0))
+
+user_cache = LRUCache(
+    maxsize=int(getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000)),
+    ttl=float(getattr(settings, 'AUTH_USER_CACHE_TTL', 300)),
+)
+
+# Claims describing the user, stamped when a token is issued or refreshed. Clients
+# can read them without calling /me/; the server keeps authorizing against the
+# (cached) user, since a token's claims can be as old as the token itself.
+USER_CLAIMS = ('user_type', 'is_active')
+
+
+# Called from the User signals. Runs after the write commits, so a request that
+# reads the old row meanwhile cannot put it back into the cache afterwards.
+
+def invalidate_user(user_id):
+    def invalidate():
+        user_cache.delete(str(user_id))
+        bump_generation(USERS)
+    transaction.on_commit(invalidate)
+
+
+def _stamp(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class UserRefreshToken(RefreshToken):
+
+    @classmethod
+    def for_user(cls, user):
+        return _stamp(super().for_user(user), user)
+
+
+# Loads the user for a token's user id through the cache; raises AuthenticationFailed
+# when the user no longer exists or is inactive
+
+def get_cached_user(user_id):
+    # simplejwt writes the id claim as a string
+    key = str(user_id)
+    generation = current_generation(USERS, max_age=GENERATION_TTL)
+    user, loaded_under = user_cache.get(key, (None, None))
+    if user is None or loaded_under != generation:
+        user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user_cache.set(key, (user, generation))
+    if not api_settings.USER_AUTHENTICATION_RULE(user):
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    # Views modify and save request.user; they get their own copy
+    return copy.copy(user)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = get_cached_user(validated_token[api_settings.USER_ID_CLAIM])
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+# token/refresh/: checks the user through the cache (no query per refresh) and
+# stamps the new access token with the user's current claims
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or api_settings.ROTATE_REFRESH_TOKENS:
+            # Rotation and blacklisting stay with simplejwt
+            return super().validate(attrs)
+        try:
+            user = get_cached_user(user_id)
+        except AuthenticationFailed:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        return {'access': str(_stamp(refresh.access_token, user))}
@@ -0,0 +1,77 @@
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models_job import Job, JobApplication
+from .response_cache import invalidate_jobs
+from .search_backends import get_search_backend
+
+logger = logging.getLogger(__name__)
+
+# Row triggers on api_jobapplication that maintain the counter (migration 0013).
+# Bulk loaders disable them and write the counts themselves.
+COUNT_TRIGGERS = ('api_jobapplication_count_trigger', 'api_jobapplication_count_move_trigger')
+
+# Lock one id range of jobs before recounting it. The count trigger of an apply
+# or withdrawal updates the job row, so once the batch is locked no counted job can
+# change until the batch commits, and changes that committed before the lock are
+# visible to the next statement (READ COMMITTED takes a new snapshot per
+# statement). Counting in the same statement as the lock would read a snapshot
+# from before the wait and overwrite a concurrent increment with a stale count.
+LOCK_SQL = f"""
+SELECT id FROM {Job._meta.db_table} WHERE id >= %s AND id < %s ORDER BY id FOR UPDATE
+"""
+
+# Recount one locked id range of jobs and fix the rows whose stored count drifted.
+# Only drifted rows are written, so a clean table costs reads only.
+RECONCILE_SQL = f"""
+UPDATE {Job._meta.db_table} AS job
+SET application_count = counts.n
+FROM (
+    SELECT job.id, COUNT(application.id) AS n
+    FROM {Job._meta.db_table} AS job
+    LEFT JOIN {JobApplication._meta.db_table} AS application ON application.job_id = job.id
+    WHERE job.id >= %s AND job.id < %s
+    GROUP BY job.id
+) AS counts
+WHERE job.id = counts.id AND job.application_count <> counts.n
+RETURNING job.id
+"""
+
+DRIFT_SQL = f"""
+SELECT COUNT(*) FROM (
+    SELECT job.id
+    FROM {Job._meta.db_table} AS job
+    LEFT JOIN {JobApplication._meta.db_table} AS application ON application.job_id = job.id
+    WHERE job.id >= %s AND job.id < %s
+    GROUP BY job.id
+    HAVING job.application_count <> COUNT(application.id)
+) AS drifted
+"""
+
+
+# Walk the job table in id batches (one short transaction each) and repair
+# counters that no longer match the applications. Applies to a batch's jobs wait
+# while it is recounted. Returns the rows fixed, or the rows that would be fixed
+# with dry_run.
+
+def reconcile_application_counts(batch_size=10000, dry_run=False):
+    max_id = Job.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+    fixed = 0
+    for low in range(0, max_id + 1, batch_size):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if dry_run:
+                cursor.execute(DRIFT_SQL, [low, low + batch_size])
+                fixed += cursor.fetchone()[0]
+            else:
+                cursor.execute(LOCK_SQL, [low, low + batch_size])
+                cursor.execute(RECONCILE_SQL, [low, low + batch_size])
+                job_ids = [row[0] for row in cursor.fetchall()]
+                if job_ids:
+                    get_search_backend().application_counts_changed(job_ids)
+                fixed += len(job_ids)
+    if fixed and not dry_run:
+        invalidate_jobs()
+    logger.info(f"Application counts: {fixed} jobs {'drifted' if dry_run else 'repaired'}")
+    return fixed
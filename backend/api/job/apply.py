@@ -0,0 +1,95 @@
+from django.db import connection
+
+from api.user.models_user import UserCV
+from .models_job import Job, JobApplication
+from .search_backends import get_search_backend
+
+CREATED = 'created'
+REPLAYED = 'replayed'
+DUPLICATE = 'duplicate'
+JOB_NOT_FOUND = 'job_not_found'
+CV_NOT_FOUND = 'cv_not_found'
+
+# One statement: the job and CV checks, the insert and the lookup of an
+# existing application all run in a single round trip. ON CONFLICT makes a
+# concurrent duplicate a no-op instead of an IntegrityError. The existing row
+# is read from the statement's snapshot, so an application committed by a
+# concurrent request in the meantime shows up as neither inserted nor
+# existing; apply_to_job() re-reads it in that case.
+APPLY_SQL = f"""
+WITH job AS (
+    SELECT id, title FROM {Job._meta.db_table} WHERE id = %(job_id)s
+), cv AS (
+    SELECT id, file_url, file_name FROM {UserCV._meta.db_table}
+    WHERE id = %(cv_id)s AND user_id = %(user_id)s
+), existing AS (
+    SELECT id, cv_id, note, applied_at, idempotency_key FROM {JobApplication._meta.db_table}
+    WHERE user_id = %(user_id)s AND job_id = %(job_id)s
+), inserted AS (
+    INSERT INTO {JobApplication._meta.db_table} (user_id, job_id, cv_id, note, applied_at, idempotency_key)
+    SELECT %(user_id)s, job.id, (SELECT id FROM cv), %(note)s, NOW(), %(idempotency_key)s
+    FROM job
+    WHERE %(cv_id)s::bigint IS NULL OR EXISTS (SELECT 1 FROM cv)
+    ON CONFLICT (user_id, job_id) DO NOTHING
+    RETURNING id, cv_id, note, applied_at, idempotency_key
+)
+SELECT
+    (SELECT title FROM job),
+    %(cv_id)s::bigint IS NULL OR EXISTS (SELECT 1 FROM cv),
+    (SELECT file_url FROM cv),
+    (SELECT file_name FROM cv),
+    inserted.id, inserted.cv_id, inserted.note, inserted.applied_at, inserted.idempotency_key,
+    existing.id, existing.cv_id, existing.note, existing.applied_at, existing.idempotency_key
+FROM (SELECT 1) AS one
+LEFT JOIN inserted ON TRUE
+LEFT JOIN existing ON TRUE
+"""
+
+
+def _application(user, job, cv, row):
+    application_id, cv_id, note, applied_at, idempotency_key = row
+    application = JobApplication(
+        id=application_id, user=user, job=job, cv_id=cv_id, note=note, applied_at=applied_at,
+        idempotency_key=idempotency_key,
+    )
+    # The CV came back with the statement; a different one (on an existing application) loads lazily
+    if cv is not None and cv.id == cv_id:
+        application.cv = cv
+    return application
+
+
+# Apply `user` to a job. Returns (outcome, application); application is None
+# unless the outcome is CREATED, REPLAYED or DUPLICATE. A request repeating the
+# Idempotency-Key of the request that created the application is REPLAYED.
+
+def apply_to_job(user, job_id, cv_id=None, note='', idempotency_key=''):
+    with connection.cursor() as cursor:
+        cursor.execute(APPLY_SQL, {
+            'user_id': user.id,
+            'job_id': job_id,
+            'cv_id': cv_id,
+            'note': note,
+            'idempotency_key': idempotency_key,
+        })
+        row = cursor.fetchone()
+    job_title, cv_found, cv_file_url, cv_file_name = row[:4]
+    inserted, existing = row[4:9], row[9:14]
+    if job_title is None:
+        return JOB_NOT_FOUND, None
+    if not cv_found:
+        return CV_NOT_FOUND, None
+    job = Job(id=job_id, title=job_title)
+    cv = UserCV(id=cv_id, user=user, file_url=cv_file_url, file_name=cv_file_name) if cv_id else None
+    if inserted[0] is not None:
+        # The count trigger changed the job's application_count
+        get_search_backend().application_counts_changed([job_id])
+        return CREATED, _application(user, job, cv, inserted)
+    if existing[0] is None:
+        # Lost the race to a request that committed after this statement's snapshot
+        existing = JobApplication.objects.filter(user=user, job_id=job_id).values_list(
+            'id', 'cv_id', 'note', 'applied_at', 'idempotency_key',
+        ).get()
+    application = _application(user, job, cv, existing)
+    if idempotency_key and application.idempotency_key == idempotency_key:
+        return REPLAYED, application
+    return DUPLICATE, application
@@ -5,10 +5,6 @@ class JobConfig(AppConfig):
     name = 'api.job'
 
     def ready(self):
-        import api.job.signals
-        try:
-            from api.job.search_indexing import reindex_all_jobs
-            reindex_all_jobs()
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to reindex jobs on startup: {e}")
+        # No indexing here: startup must not scale with the catalog.
+        # Use `manage.py sync_search_index` (incremental) or `reindex_jobs` (full rebuild).
+        import api.job.signals  # noqa: F401
@@ -0,0 +1,82 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models_job import CacheGeneration, Job
+from .response_cache import JOB_CATALOG
+
+# Conditional GET for the job list and detail. Validators come from a cheap
+# aggregate (max updated_at, row count) or a single-column lookup, so a
+# matching If-None-Match / If-Modified-Since is answered with 304 before any
+# rows are fetched or serialized.
+
+
+def _representation(request):
+    # Different pages, page sizes and renderers are different representations
+    return f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+
+
+def _etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _list_state(request):
+    # Computed once per request; condition() asks for the ETag and Last-Modified separately
+    state = getattr(request, '_job_list_state', None)
+    if state is None:
+        state = Job.objects.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        # Deleting a job leaves max(updated_at) alone, but bumps the catalog generation
+        deleted_at = CacheGeneration.objects.filter(name=JOB_CATALOG).values_list('updated_at', flat=True).first()
+        if deleted_at and (state['last_modified'] is None or deleted_at > state['last_modified']):
+            state['last_modified'] = deleted_at
+        request._job_list_state = state
+    return state
+
+
+def job_list_etag(request, *args, **kwargs):
+    state = _list_state(request)
+    last_modified = state['last_modified'].isoformat() if state['last_modified'] else ''
+    return _etag('jobs', last_modified, state['count'], _representation(request))
+
+
+def job_list_last_modified(request, *args, **kwargs):
+    return _list_state(request)['last_modified']
+
+
+def _detail_updated_at(request, pk):
+    if not hasattr(request, '_job_updated_at'):
+        request._job_updated_at = Job.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    return request._job_updated_at
+
+
+def job_detail_etag(request, pk, *args, **kwargs):
+    updated_at = _detail_updated_at(request, pk)
+    if updated_at is None:
+        # Missing job: no validator, the view answers 404
+        return None
+    return _etag('job', pk, updated_at.isoformat(), _representation(request))
+
+
+def job_detail_last_modified(request, pk, *args, **kwargs):
+    return _detail_updated_at(request, pk)
+
+
+# Decorator for a DRF view's get(). Adds strong ETag and Last-Modified
+# headers, answers matching conditional requests with 304, and asks clients
+# to revalidate before reusing a stored copy.
+
+def conditional_job_response(etag_func, last_modified_func):
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            conditional = condition(etag_func=etag_func, last_modified_func=last_modified_func)(
+                lambda request, *args, **kwargs: get(view, request, *args, **kwargs)
+            )
+            response = conditional(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
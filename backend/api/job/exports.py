@@ -0,0 +1,47 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .serializers_job import JobApplicationSerializer
+
+EXPORT_FIELDS = JobApplicationSerializer.Meta.fields
+# Rows serialized (and CV links presigned) together; memory stays bounded by one batch
+EXPORT_BATCH_SIZE = 500
+
+
+class _Echo:
+    # csv.writer target that hands each formatted line back instead of buffering it
+    def write(self, value):
+        return value
+
+
+def _batches(applications, batch_size):
+    # iterator() streams rows through a server-side cursor instead of loading the whole result
+    rows = applications.iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        # The list serializer presigns the batch's CV links in one pass
+        yield JobApplicationSerializer(batch, many=True).data
+
+
+def iter_csv(applications, batch_size=EXPORT_BATCH_SIZE):
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for batch in _batches(applications, batch_size):
+        yield ''.join(writer.writerow(row) for row in batch)
+
+
+def iter_ndjson(applications, batch_size=EXPORT_BATCH_SIZE):
+    for batch in _batches(applications, batch_size):
+        yield ''.join(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in batch)
+
+
+# ?output= value -> (content type, row generator)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', iter_csv),
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+}
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.db.models.functions import Left
+from rest_framework import serializers
+
+from api.timing import timed
+from .serializers_job import JobSerializer
+
+# Read-only fast path for job payloads: rows come from values_list() instead of
+# model instances, and only the fields whose representation differs from the
+# stored value get a converter. The output matches JobSerializer(many=True).data.
+
+JOB_FIELDS = tuple(JobSerializer.Meta.fields)
+# Optional bounded preview of the description, for list screens (?fields=...,description_snippet)
+SNIPPET_FIELD = 'description_snippet'
+SNIPPET_LENGTH = int(getattr(settings, 'JOB_DESCRIPTION_SNIPPET_LENGTH', 160))
+SELECTABLE_FIELDS = JOB_FIELDS + (SNIPPET_FIELD,)
+
+# DRF fields whose to_representation() returns database values unchanged
+_PASSTHROUGH = (serializers.CharField, serializers.IntegerField, serializers.JSONField, serializers.ChoiceField)
+
+
+# Collapse whitespace and cut at a word boundary; the result, ellipsis included, is
+# at most `length` characters. `text` is the description or a prefix of it carrying
+# one character past SNIPPET_LENGTH, which tells whether the description goes on.
+def make_snippet(text, length=SNIPPET_LENGTH):
+    if len(text) <= length:
+        return ' '.join(text.split())
+    # Leave room for the ellipsis
+    cut = max(length - 1, 0)
+    snippet = ' '.join(text[:cut].split())
+    if not text[cut].isspace() and ' ' in snippet:
+        # Drop the word the cut went through
+        snippet = snippet.rsplit(' ', 1)[0]
+    return snippet.rstrip('.,;:') + '…'
+
+
+# What the snippet is cut from, the same prefix in Postgres (Left()) and OpenSearch documents
+def snippet_source(description):
+    return description[:SNIPPET_LENGTH + 1]
+
+
+def _compile_converters():
+    fields = JobSerializer().fields
+    converters = {
+        name: fields[name].to_representation
+        for name in JOB_FIELDS
+        if not isinstance(fields[name], _PASSTHROUGH)
+    }
+    converters[SNIPPET_FIELD] = make_snippet
+    return converters
+
+
+CONVERTERS = _compile_converters()
+
+
+# The ?fields= sparse fieldset: a comma-separated subset of SELECTABLE_FIELDS,
+# returned in payload order. None (all of JOB_FIELDS) when absent or empty.
+# Raises ValueError naming any unknown field.
+
+def parse_fields(value):
+    requested = {name.strip() for name in (value or '').split(',') if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(SELECTABLE_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(SELECTABLE_FIELDS)}."
+        )
+    return tuple(name for name in SELECTABLE_FIELDS if name in requested)
+
+
+# Named rows keep attribute access (row.id, row.created_at) for keyset pagination.
+# Only the selected fields are read; the snippet is cut in the database so the
+# full description never leaves it. `extra` columns (sort keys) are appended
+# unless already selected.
+def job_values(queryset, fields=None, extra=()):
+    fields = fields or JOB_FIELDS
+    if SNIPPET_FIELD in fields:
+        queryset = queryset.annotate(**{SNIPPET_FIELD: Left('description', SNIPPET_LENGTH + 1)})
+    columns = list(fields) + [name for name in extra if name not in fields]
+    return queryset.values_list(*columns, named=True)
+
+
+# Rows start with the selected fields; trailing extra columns are left out
+@timed('serialize')
+def job_rows_to_data(rows, fields=None):
+    fields = fields or JOB_FIELDS
+    width = len(fields)
+    converters = [(index, CONVERTERS[name]) for index, name in enumerate(fields) if name in CONVERTERS]
+    data = []
+    for row in rows:
+        values = list(row[:width])
+        for index, convert in converters:
+            if values[index] is not None:
+                values[index] = convert(values[index])
+        data.append(dict(zip(fields, values)))
+    return data
+
+
+# Project an already serialized job (memory index doc, OpenSearch _source) onto a fieldset
+def select_fields(doc, fields=None):
+    if not fields:
+        return doc
+    data = {name: doc.get(name) for name in fields if name != SNIPPET_FIELD}
+    if SNIPPET_FIELD in fields:
+        data[SNIPPET_FIELD] = doc.get(SNIPPET_FIELD)
+        if data[SNIPPET_FIELD] is None and doc.get('description') is not None:
+            data[SNIPPET_FIELD] = make_snippet(doc['description'])
+    return data
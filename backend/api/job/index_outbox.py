@@ -0,0 +1,154 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .models_job import Job, JobIndexOutbox
+from .opensearch_client import get_opensearch_client
+from .response_cache import invalidate_jobs
+from .search_indexing import index_action, delete_action, ensure_index_template_once
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(getattr(settings, 'SEARCH_OUTBOX_BATCH_SIZE', 500))
+BACKOFF_BASE = float(getattr(settings, 'SEARCH_OUTBOX_BACKOFF_BASE', 2))
+BACKOFF_MAX = float(getattr(settings, 'SEARCH_OUTBOX_BACKOFF_MAX', 300))
+# Failed shipments before a row is parked instead of retried
+MAX_ATTEMPTS = int(getattr(settings, 'SEARCH_OUTBOX_MAX_ATTEMPTS', 10))
+# How long a claimed row is hidden from other workers; longer than a bulk request can take
+CLAIM_TIMEOUT = timedelta(seconds=float(getattr(settings, 'SEARCH_OUTBOX_CLAIM_TIMEOUT', 120)))
+
+
+# Record a pending index change for a job (called from the Job signals)
+
+def enqueue_job_change(job_id, op):
+    JobIndexOutbox.objects.create(job_id=job_id, op=op)
+
+
+def enqueue_job_changes(job_ids, op):
+    JobIndexOutbox.objects.bulk_create(JobIndexOutbox(job_id=job_id, op=op) for job_id in job_ids)
+
+
+# Exponential backoff with full jitter, capped at BACKOFF_MAX seconds
+
+def retry_delay(attempts):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=random.uniform(0, delay))
+
+
+# Build one bulk action per job. Rows are coalesced by job id and resolved
+# against the current database state, so any number of updates to the same
+# job collapse into a single index (or delete, if the job is gone).
+
+def _build_actions(job_ids):
+    jobs = Job.objects.in_bulk(job_ids)
+    return [
+        index_action(jobs[job_id]) if job_id in jobs else delete_action(job_id)
+        for job_id in job_ids
+    ]
+
+
+def _ship(actions):
+    from opensearchpy.helpers import streaming_bulk
+    client = get_opensearch_client()
+    ensure_index_template_once(client)
+    failed = {}
+    results = streaming_bulk(
+        client,
+        actions,
+        chunk_size=len(actions),
+        raise_on_error=False,
+        yield_ok=True,
+    )
+    for ok, item in results:
+        op_type, info = next(iter(item.items()))
+        # Deleting a document that was never indexed is not an error
+        if ok or (op_type == 'delete' and info.get('status') == 404):
+            continue
+        failed[int(info['_id'])] = str(info.get('error') or info.get('status'))
+    return failed
+
+
+# Claim a batch of ready outbox rows. Rows are locked with SELECT ... FOR UPDATE
+# SKIP LOCKED, so several workers can drain the outbox concurrently, and leased
+# for CLAIM_TIMEOUT by moving available_at forward. The transaction ends before
+# anything is sent to OpenSearch; a worker that dies mid-batch leaves its rows to
+# be claimed again once the lease runs out.
+
+def claim_batch(batch_size, now):
+    with transaction.atomic():
+        rows = list(
+            JobIndexOutbox.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now, attempts__lt=MAX_ATTEMPTS)
+            .order_by('id')[:batch_size]
+        )
+        if rows:
+            JobIndexOutbox.objects.filter(id__in=[row.id for row in rows]).update(available_at=now + CLAIM_TIMEOUT)
+    return rows
+
+
+# Claim and ship one batch of outbox rows, then delete the rows that landed and
+# schedule the rest for a retry. A row that fails MAX_ATTEMPTS times is parked:
+# no worker claims it again until `run_index_worker --requeue-parked`.
+# Returns the number of rows claimed.
+
+def process_batch(batch_size=None):
+    rows = claim_batch(batch_size or BATCH_SIZE, timezone.now())
+    if not rows:
+        return 0
+    job_ids = list(dict.fromkeys(row.job_id for row in rows))
+    try:
+        failed = _ship(_build_actions(job_ids))
+    except Exception as e:
+        logger.warning(f"Bulk request for {len(job_ids)} jobs failed: {e}")
+        failed = {job_id: str(e) for job_id in job_ids}
+
+    now = timezone.now()
+    retry_rows = [row for row in rows if row.job_id in failed]
+    for row in retry_rows:
+        row.attempts += 1
+        row.available_at = now + retry_delay(row.attempts)
+        row.last_error = failed[row.job_id][:1000]
+    with transaction.atomic():
+        done_ids = [row.id for row in rows if row.job_id not in failed]
+        if done_ids:
+            JobIndexOutbox.objects.filter(id__in=done_ids).delete()
+            # Cached search pages may predate these documents
+            invalidate_jobs()
+        if retry_rows:
+            JobIndexOutbox.objects.bulk_update(retry_rows, ['attempts', 'available_at', 'last_error'])
+    parked = [row for row in retry_rows if row.attempts >= MAX_ATTEMPTS]
+    if parked:
+        logger.error(
+            f"Parked {len(parked)} outbox rows after {MAX_ATTEMPTS} attempts "
+            f"(jobs {', '.join(str(row.job_id) for row in parked[:20])}): {parked[0].last_error}"
+        )
+    if len(retry_rows) > len(parked):
+        logger.warning(f"{len(retry_rows) - len(parked)} outbox rows scheduled for retry")
+    logger.info(f"Indexed {len(job_ids) - len(failed)} of {len(job_ids)} jobs from {len(rows)} outbox rows")
+    return len(rows)
+
+
+# Make parked rows claimable again (after fixing whatever made them fail)
+def requeue_parked():
+    return JobIndexOutbox.objects.filter(attempts__gte=MAX_ATTEMPTS).update(
+        attempts=0, available_at=timezone.now(),
+    )
+
+
+# Queue depth and lag (age of the oldest pending change) for monitoring
+
+def outbox_stats():
+    stats = JobIndexOutbox.objects.aggregate(
+        depth=Count('id'),
+        retrying=Count('id', filter=Q(attempts__gt=0, attempts__lt=MAX_ATTEMPTS)),
+        parked=Count('id', filter=Q(attempts__gte=MAX_ATTEMPTS)),
+        oldest=Min('created_at'),
+    )
+    oldest = stats.pop('oldest')
+    stats['lag_seconds'] = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return stats
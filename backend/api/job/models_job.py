@@ -1,7 +1,16 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.utils import timezone
 from api.user.models_user import User, UserCV
 
 
+class JobManager(models.Manager):
+    # search_vector is only read inside SQL; never ship it to Python
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class Job(models.Model):
     EMPLOYMENT_TYPE_CHOICES = [
         ("Full-time", "Full-time"),
@@ -14,6 +23,33 @@ class Job(models.Model):
     tags = models.JSONField(default=list, blank=True)  # Store tags as a list of strings
     employment_type = models.CharField(max_length=20, choices=EMPLOYMENT_TYPE_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by a database trigger (see migration 0009) for the Postgres search backend
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by a trigger on api_jobapplication (see migrations 0013 and 0016);
+    # `reconcile_application_counts` repairs drift
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = JobManager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='job_search_vector_gin'),
+            # Newest-first listing and keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='job_created_at_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Never write back a stale copy of the trigger-maintained counter on update
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred and field.name != 'application_count'
+            ]
+        # Keep the row and its search outbox entry (written by post_save) in one transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -24,9 +60,74 @@ class JobApplication(models.Model):
     cv = models.ForeignKey(UserCV, on_delete=models.SET_NULL, null=True, blank=True, related_name='applications')
     note = models.CharField(max_length=500, blank=True, default='')
     applied_at = models.DateTimeField(auto_now_add=True)
+    # Idempotency-Key of the request that created the application, so a retried apply can be recognised
+    idempotency_key = models.CharField(max_length=255, blank=True, default='')
 
     class Meta:
         unique_together = ('user', 'job')
 
     def __str__(self):
         return f"{self.user.email} applied to {self.job.title}"
+
+
+# Pending search index changes, written in the same transaction as the Job change
+# and drained by the `run_index_worker` management command.
+class JobIndexOutbox(models.Model):
+    OP_INDEX = 'index'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [
+        (OP_INDEX, 'Index'),
+        (OP_DELETE, 'Delete'),
+    ]
+    job_id = models.BigIntegerField(db_index=True)  # No FK: the job may already be deleted
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.op} job {self.job_id}"
+
+
+# Job changes that in-process search indexes (the memory backend) cannot find by
+# updated_at: deletions and application count changes. Every process reads the
+# log on refresh; entries older than SEARCH_MEMORY_CHANGE_RETENTION are pruned.
+class JobChange(models.Model):
+    OP_DELETE = 'delete'
+    OP_COUNT = 'count'
+    OP_CHOICES = [
+        (OP_DELETE, 'Delete'),
+        (OP_COUNT, 'Application count'),
+    ]
+    job_id = models.BigIntegerField()  # No FK: the job is usually gone
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.op} job {self.job_id}"
+
+
+# High-watermark of Job.updated_at already pushed to a search index,
+# used by the incremental `sync_search_index` command.
+class SearchSyncCheckpoint(models.Model):
+    index_name = models.CharField(max_length=255, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.index_name} synced to {self.watermark}"
+
+
+# Version counter for a cached catalog. Writers increment it and readers
+# embed it in their cache keys, so one bump invalidates every cached page.
+class CacheGeneration(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} generation {self.value}"
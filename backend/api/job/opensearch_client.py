@@ -1,20 +1,191 @@
-from opensearchpy import OpenSearch
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
 from django.conf import settings
 
+from api.timing import timed
+
 # You should set these in your Django settings or .env
 OPENSEARCH_HOST = str(getattr(settings, 'OPENSEARCH_HOST', 'localhost'))
 OPENSEARCH_PORT = int(getattr(settings, 'OPENSEARCH_PORT', 9200))  # Ensure port is int
 OPENSEARCH_USER = str(getattr(settings, 'OPENSEARCH_USER', '') or '')
 OPENSEARCH_PASS = str(getattr(settings, 'OPENSEARCH_PASS', '') or '')
+# Connections kept per host; size it to the number of threads that search concurrently
+OPENSEARCH_POOL_SIZE = int(getattr(settings, 'OPENSEARCH_POOL_SIZE', 10))
+# Per-request timeout in seconds, so a slow cluster cannot hold a worker indefinitely
+OPENSEARCH_TIMEOUT = float(getattr(settings, 'OPENSEARCH_TIMEOUT', 5))
+# Retries on connection errors and timeouts, with jittered exponential backoff
+OPENSEARCH_RETRIES = int(getattr(settings, 'OPENSEARCH_RETRIES', 2))
+OPENSEARCH_RETRY_BACKOFF = float(getattr(settings, 'OPENSEARCH_RETRY_BACKOFF', 0.1))
 
-client = OpenSearch(
-    hosts=[{'host': OPENSEARCH_HOST, 'port': OPENSEARCH_PORT}],
-    http_auth=(OPENSEARCH_USER, OPENSEARCH_PASS) if OPENSEARCH_USER and OPENSEARCH_PASS else None,  # For master user
-    use_ssl=True,
-    verify_certs=True,
-    ssl_assert_hostname=False,
-    ssl_show_warn=True,
-)
+
+def _client_options():
+    return dict(
+        hosts=[{'host': OPENSEARCH_HOST, 'port': OPENSEARCH_PORT}],
+        http_auth=(OPENSEARCH_USER, OPENSEARCH_PASS) if OPENSEARCH_USER and OPENSEARCH_PASS else None,  # For master user
+        use_ssl=True,
+        verify_certs=True,
+        ssl_assert_hostname=False,
+        ssl_show_warn=True,
+        timeout=OPENSEARCH_TIMEOUT,
+        # Retries are handled by call_with_retries, which backs off between attempts
+        max_retries=0,
+        retry_on_timeout=False,
+    )
+
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+# Built on first use, not at import time; one pooled client per process
 
 def get_opensearch_client():
-    return client
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from opensearchpy import OpenSearch
+                _client = OpenSearch(pool_maxsize=OPENSEARCH_POOL_SIZE, **_client_options())
+    return _client
+
+
+# Async variant for views running under ASGI (requires opensearch-py[async])
+
+def get_async_opensearch_client():
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                from opensearchpy import AsyncOpenSearch
+                _async_client = AsyncOpenSearch(pool_maxsize=OPENSEARCH_POOL_SIZE, **_client_options())
+    return _async_client
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+# Opens once the error rate over a sliding window crosses failure_rate, then
+# rejects calls immediately for reset_timeout seconds before letting a single
+# trial call through (half-open). A successful trial closes the circuit.
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window=30.0, reset_timeout=15.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.events = deque()
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allow(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok):
+        now = time.monotonic()
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.trial_in_flight = False
+                if ok:
+                    self.state = self.CLOSED
+                    self.events.clear()
+                else:
+                    self._open(now)
+                return
+            self.events.append((now, ok))
+            while self.events and self.events[0][0] < now - self.window:
+                self.events.popleft()
+            failures = sum(1 for _, event_ok in self.events if not event_ok)
+            if len(self.events) >= self.min_calls and failures / len(self.events) >= self.failure_rate:
+                self._open(now)
+
+    def _open(self, now):
+        self.state = self.OPEN
+        self.opened_at = now
+        self.events.clear()
+
+
+search_breaker = CircuitBreaker(
+    failure_rate=float(getattr(settings, 'SEARCH_BREAKER_FAILURE_RATE', 0.5)),
+    min_calls=int(getattr(settings, 'SEARCH_BREAKER_MIN_CALLS', 10)),
+    window=float(getattr(settings, 'SEARCH_BREAKER_WINDOW_SECONDS', 30)),
+    reset_timeout=float(getattr(settings, 'SEARCH_BREAKER_RESET_SECONDS', 15)),
+)
+
+
+def _is_failure(error):
+    # Cluster-side trouble counts against the breaker; 4xx answers (bad cursor, missing index) do not
+    from opensearchpy.exceptions import ConnectionError, TransportError
+    if isinstance(error, ConnectionError):
+        return True
+    return isinstance(error, TransportError) and isinstance(error.status_code, int) and error.status_code >= 500
+
+
+def _retry_delay(attempt):
+    return random.uniform(0, OPENSEARCH_RETRY_BACKOFF * (2 ** attempt))
+
+
+# Run a client call through the breaker, retrying connection errors and timeouts.
+# Backoff sleeps count towards the request's opensearch timing.
+
+@timed('opensearch')
+def call_with_retries(func, *args, breaker=search_breaker, retries=OPENSEARCH_RETRIES, **kwargs):
+    from opensearchpy.exceptions import ConnectionError
+    if not breaker.allow():
+        raise CircuitOpenError('OpenSearch circuit is open')
+    for attempt in range(retries + 1):
+        try:
+            result = func(*args, **kwargs)
+        except ConnectionError:
+            if attempt < retries:
+                time.sleep(_retry_delay(attempt))
+                continue
+            breaker.record(False)
+            raise
+        except Exception as e:
+            breaker.record(not _is_failure(e))
+            raise
+        breaker.record(True)
+        return result
+
+
+async def acall_with_retries(func, *args, breaker=search_breaker, retries=OPENSEARCH_RETRIES, **kwargs):
+    from opensearchpy.exceptions import ConnectionError
+    if not breaker.allow():
+        raise CircuitOpenError('OpenSearch circuit is open')
+    with timed('opensearch'):
+        for attempt in range(retries + 1):
+            try:
+                result = await func(*args, **kwargs)
+            except ConnectionError:
+                if attempt < retries:
+                    await asyncio.sleep(_retry_delay(attempt))
+                    continue
+                breaker.record(False)
+                raise
+            except Exception as e:
+                breaker.record(not _is_failure(e))
+                raise
+            breaker.record(True)
+            return result
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models_job import Job
+from .search_backends import InvalidCursor, decode_cursor, encode_cursor
+
+CURSOR_NAME = 'jobs'
+
+
+def _truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+# Page-number pagination by default (?page=N). With ?paginate=cursor the list
+# switches to keyset pagination on (created_at, id): each page continues from
+# the last row of the previous one through the (created_at, id) index, so
+# page 10,000 costs the same as page 1 and no COUNT(*) runs unless ?count=true.
+# The queryset must be ordered by ('-created_at', '-id').
+
+class JobPagination(pagination.PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = (
+            request.query_params.get('paginate') == 'cursor' or self.cursor_query_param in request.query_params
+        )
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.count = queryset.count() if _truthy(request.query_params.get('count')) else None
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, job_id = self.decode_position(cursor)
+            queryset = queryset.filter(RawSQL(
+                f'("{Job._meta.db_table}"."created_at", "{Job._meta.db_table}"."id") < (%s, %s)',
+                [created_at, job_id],
+                output_field=BooleanField(),
+            ))
+        # One extra row tells whether another page follows
+        jobs = list(queryset[:page_size + 1])
+        self.next_cursor = None
+        if len(jobs) > page_size:
+            jobs = jobs[:page_size]
+            last = jobs[-1]
+            self.next_cursor = encode_cursor(CURSOR_NAME, after=[last.created_at.isoformat(), last.id])
+        return jobs
+
+    def decode_position(self, cursor):
+        try:
+            data = decode_cursor(CURSOR_NAME, cursor)
+            created_at, job_id = data['after']
+            created_at, job_id = parse_datetime(created_at), int(job_id)
+        except (InvalidCursor, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, job_id
+
+    def get_next_link(self):
+        if self.keyset:
+            if self.next_cursor is None:
+                return None
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        body = OrderedDict()
+        if self.count is not None:
+            body['count'] = self.count
+        body['next'] = self.get_next_link()
+        body['next_cursor'] = self.next_cursor
+        body['results'] = data
+        return Response(body)
+
+
+class ApplicantPagination(pagination.PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
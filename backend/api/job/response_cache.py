@@ -0,0 +1,114 @@
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+
+from api.lru_cache import LRUCache
+from .models_job import CacheGeneration
+
+# Public job reads (list, detail, search) are cached per process. Every cache
+# key embeds the current generation of the job catalog; saving or deleting a
+# job bumps the generation, so all older entries simply stop being addressed
+# and age out of the LRU.
+JOB_CATALOG = 'jobs'
+
+CACHE_ENABLED = bool(getattr(settings, 'JOB_CACHE_ENABLED', True))
+CACHE_TTL = float(getattr(settings, 'JOB_CACHE_TTL', 300))
+# Search results also depend on the index worker, so they expire sooner
+SEARCH_CACHE_TTL = float(getattr(settings, 'JOB_SEARCH_CACHE_TTL', 30))
+# How long a process trusts its last read of the generation counter
+GENERATION_TTL = float(getattr(settings, 'JOB_CACHE_GENERATION_TTL', 1.0))
+
+response_cache = LRUCache(maxsize=int(getattr(settings, 'JOB_CACHE_MAX_ENTRIES', 1000)), ttl=CACHE_TTL)
+
+_generations = {}
+_generations_lock = threading.Lock()
+
+
+# `max_age` is how long this process trusts its last read (GENERATION_TTL by default)
+def current_generation(name=JOB_CATALOG, max_age=None):
+    max_age = GENERATION_TTL if max_age is None else max_age
+    now = time.monotonic()
+    with _generations_lock:
+        cached = _generations.get(name)
+    if cached and now - cached[1] < max_age:
+        return cached[0]
+    value = CacheGeneration.objects.filter(name=name).values_list('value', flat=True).first() or 0
+    with _generations_lock:
+        _generations[name] = (value, now)
+    return value
+
+
+def bump_generation(name=JOB_CATALOG):
+    updated = CacheGeneration.objects.filter(name=name).update(value=F('value') + 1, updated_at=timezone.now())
+    if not updated:
+        CacheGeneration.objects.get_or_create(name=name, defaults={'value': 1})
+    # This process sees its own writes immediately; others within GENERATION_TTL
+    with _generations_lock:
+        _generations.pop(name, None)
+
+
+# Bump after the surrounding transaction commits, so a reader can never cache
+# pre-commit data under the new generation
+
+def invalidate_jobs():
+    transaction.on_commit(bump_generation)
+
+
+def _normalize_params(params):
+    # Parameter order and repeated-value order do not change the response
+    return tuple(sorted((name, tuple(sorted(values))) for name, values in params.lists()))
+
+
+def _detach(data):
+    # ReturnDict/ReturnList hold their serializer (and its model instances); keep plain containers only
+    if isinstance(data, dict):
+        return {key: _detach(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_detach(value) for value in data]
+    return data
+
+
+def cache_lookup(namespace, kwargs, params):
+    key = (namespace, current_generation(), tuple(sorted(kwargs.items())), _normalize_params(params))
+    return key, response_cache.get(key)
+
+
+def cache_store(key, data, ttl=None):
+    response_cache.set(key, _detach(data), ttl=ttl)
+
+
+# Decorator for a DRF view's get(): serve 200 responses from the cache and mark
+# every response with an X-Cache header
+
+def cache_job_response(namespace, ttl=None):
+    def decorator(get):
+        @wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            if not CACHE_ENABLED:
+                return get(view, request, *args, **kwargs)
+            key, data = cache_lookup(namespace, kwargs, request.query_params)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+            response = get(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache_store(key, response.data, ttl=ttl)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    return {
+        'enabled': CACHE_ENABLED,
+        'generation': current_generation(),
+        'responses': response_cache.stats(),
+    }
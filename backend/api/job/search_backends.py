@@ -0,0 +1,553 @@
+import base64
+import binascii
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.utils.module_loading import import_string
+
+from .fast_serializers import SNIPPET_FIELD, job_rows_to_data, job_values, make_snippet
+from .models_job import Job, JobIndexOutbox
+from .serializers_job import JobSerializer
+
+logger = logging.getLogger(__name__)
+
+# Fields returned per hit; the index stores all of them in _source
+RESULT_FIELDS = JobSerializer.Meta.fields
+# Document field description_snippet is cut from (see search_indexing.job_to_document)
+SNIPPET_SOURCE_FIELD = 'description_prefix'
+# Multi-valued filters (OR within a field, AND across fields)
+FILTER_FIELDS = ('employment_type', 'location', 'tags')
+FACET_SIZES = {'employment_type': 10, 'location': 20, 'tags': 30}
+PIT_KEEP_ALIVE = getattr(settings, 'SEARCH_PIT_KEEP_ALIVE', '2m')
+# Result orders: relevance (score, then id) or popular (application_count, then id)
+SORT_RELEVANCE = 'relevance'
+SORT_POPULAR = 'popular'
+SORTS = (SORT_RELEVANCE, SORT_POPULAR)
+
+BACKENDS = {
+    'opensearch': 'api.job.search_backends.OpenSearchBackend',
+    'postgres': 'api.job.search_backends.PostgresSearchBackend',
+    'memory': 'api.job.search_memory.MemorySearchBackend',
+}
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+# The engine cannot answer right now (cluster down, timeouts, circuit open)
+class SearchUnavailable(Exception):
+    pass
+
+
+# Search backends take a query, the parsed filters
+# ({'employment_type': [...], 'location': [...], 'tags': [...], 'created_after': dt, 'created_before': dt})
+# and paging options, and return
+# {'results', 'total', 'total_relation', 'facets', 'next_cursor'}.
+# Results are ordered by `sort` (see SORTS), then job id. `fields` is a sparse
+# fieldset from fast_serializers.parse_fields(); None returns every field.
+
+class SearchBackend:
+    name = None
+
+    def search(self, query, filters, page=1, page_size=20, cursor=None, use_cursor=False,
+               track_total_hits=True, facets=False, hydrate=False, sort=SORT_RELEVANCE, fields=None):
+        raise NotImplementedError
+
+    # Native async engines override this; the default runs search() in a worker thread
+    async def asearch(self, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+        return await sync_to_async(self.search)(*args, **kwargs)
+
+    def autocomplete(self, query, size=5, timeout=None):
+        raise NotImplementedError
+
+    # Called from the Job post_save/post_delete signals, inside the write's transaction
+    def job_saved(self, job):
+        pass
+
+    def job_deleted(self, job_id):
+        pass
+
+    # Called when applications were added or withdrawn, inside the write's
+    # transaction. The count trigger has already updated Job.application_count.
+    def application_counts_changed(self, job_ids):
+        pass
+
+
+# The cursor is opaque to clients: base64 JSON tagged with the backend that issued it
+
+def encode_cursor(backend_name, **data):
+    raw = json.dumps(dict(data, b=backend_name), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+# Cursors are only valid for the order they were issued for
+def cursor_tag(backend_name, sort):
+    return backend_name if sort == SORT_RELEVANCE else f'{backend_name}:{sort}'
+
+
+def decode_cursor(backend_name, cursor):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor.')
+    if not isinstance(data, dict) or data.get('b') != backend_name:
+        raise InvalidCursor('Invalid cursor.')
+    return data
+
+
+# Name of the backend that issued a cursor, or None when it cannot be read
+def cursor_backend(cursor):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        return None
+    tag = data.get('b') if isinstance(data, dict) else None
+    return tag.split(':')[0] if isinstance(tag, str) else None
+
+
+# Load jobs by id from Postgres and serialize them in the given order
+
+def hydrate_jobs(job_ids, fields=None):
+    rows = {row.id: row for row in job_values(Job.objects.filter(id__in=job_ids), fields, extra=('id',))}
+    return job_rows_to_data((rows[job_id] for job_id in job_ids if job_id in rows), fields)
+
+
+# Shape an OpenSearch hit like JobSerializer output; the snippet is cut from the
+# stored description prefix, exactly as the other backends cut it
+
+def result_from_source(source, fields=None):
+    fields = fields or RESULT_FIELDS
+    result = {field: source.get(field) for field in fields if field != SNIPPET_FIELD}
+    created_at = result.get('created_at')
+    if created_at and created_at.endswith('+00:00'):
+        # DRF renders UTC datetimes with a Z suffix
+        result['created_at'] = created_at[:-6] + 'Z'
+    if SNIPPET_FIELD in fields:
+        result[SNIPPET_FIELD] = make_snippet(source.get(SNIPPET_SOURCE_FIELD) or '')
+    return result
+
+
+class OpenSearchBackend(SearchBackend):
+    name = 'opensearch'
+    # The job id is a stable tiebreaker for search_after
+    sort_orders = {
+        SORT_RELEVANCE: [{"_score": "desc"}, {"id": "asc"}],
+        SORT_POPULAR: [{"application_count": "desc"}, {"id": "asc"}],
+    }
+
+    def __init__(self):
+        from .opensearch_client import get_opensearch_client
+        from .search_indexing import INDEX_NAME
+        self.client = get_opensearch_client()
+        self.index = INDEX_NAME
+
+    # Full-text match with typo tolerance, plus prefix matching through the
+    # edge n-gram subfields (no wildcard query_string, user input is never parsed
+    # as query syntax)
+    def build_query(self, query):
+        if not query.strip():
+            return {"match_all": {}}
+        return {
+            "bool": {
+                "should": [
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": ["title^3", "company^2", "description", "location", "tags", "employment_type"],
+                            "fuzziness": "AUTO"
+                        }
+                    },
+                    {
+                        "multi_match": {
+                            "query": query,
+                            "fields": ["title.autocomplete^3", "company.autocomplete^2", "tags.autocomplete"],
+                            "operator": "and"
+                        }
+                    }
+                ],
+                "minimum_should_match": 1
+            }
+        }
+
+    # Structured filters run in filter context (no scoring, cacheable by OpenSearch)
+    # against the keyword subfields
+    def build_filters(self, filters):
+        clauses = []
+        for name in FILTER_FIELDS:
+            if filters.get(name):
+                clauses.append({"terms": {f"{name}.keyword": filters[name]}})
+        created_range = {}
+        if filters.get('created_after'):
+            created_range['gte'] = filters['created_after'].isoformat()
+        if filters.get('created_before'):
+            created_range['lte'] = filters['created_before'].isoformat()
+        if created_range:
+            clauses.append({"range": {"created_at": created_range}})
+        return clauses
+
+    def _body(self, query, filters, page, page_size, use_cursor, track_total_hits, facets, hydrate, sort, fields):
+        source = [field if field != SNIPPET_FIELD else SNIPPET_SOURCE_FIELD for field in fields or RESULT_FIELDS]
+        body = {
+            "query": {"bool": {"must": self.build_query(query), "filter": self.build_filters(filters)}},
+            "size": page_size,
+            "_source": source if source and not hydrate else False,
+            "track_total_hits": track_total_hits,
+        }
+        if facets:
+            body["aggs"] = {
+                name: {"terms": {"field": f"{name}.keyword", "size": size}}
+                for name, size in FACET_SIZES.items()
+            }
+        if sort != SORT_RELEVANCE or use_cursor:
+            body["sort"] = self.sort_orders[sort]
+        if not use_cursor:
+            body["from"] = (page - 1) * page_size
+        return body
+
+    def _apply_cursor(self, body, pit_id, data):
+        body["pit"] = {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}
+        if data.get('after'):
+            body["search_after"] = data['after']
+
+    def _result(self, resp, page_size, use_cursor, facets, pit_id, sort, fields):
+        hits = resp['hits']['hits']
+        total = resp['hits'].get('total')
+        result = {
+            'results': [result_from_source(hit.get('_source', {}), fields) for hit in hits],
+            'ids': [int(hit['_id']) for hit in hits],
+            'total': total['value'] if total else None,
+            'total_relation': total['relation'] if total else None,
+            'facets': None,
+            'next_cursor': None,
+        }
+        if facets:
+            aggs = resp.get('aggregations', {})
+            result['facets'] = {
+                name: [{'value': bucket['key'], 'count': bucket['doc_count']} for bucket in aggs[name]['buckets']]
+                for name in FACET_SIZES if name in aggs
+            }
+        if use_cursor and len(hits) == page_size:
+            result['next_cursor'] = encode_cursor(
+                cursor_tag(self.name, sort), pit=resp.get('pit_id', pit_id), after=hits[-1]['sort'],
+            )
+        return result
+
+    # Client calls go through the circuit breaker and jittered retries; cluster
+    # failures surface as SearchUnavailable, a missing PIT as an expired cursor
+    def _call(self, func, *args, **kwargs):
+        from opensearchpy.exceptions import NotFoundError
+        from .opensearch_client import CircuitOpenError, call_with_retries, _is_failure
+        try:
+            return call_with_retries(func, *args, **kwargs)
+        except NotFoundError:
+            if 'pit' in kwargs.get('body', {}):
+                raise InvalidCursor('Cursor expired.')
+            raise
+        except CircuitOpenError as e:
+            raise SearchUnavailable(str(e)) from e
+        except Exception as e:
+            if _is_failure(e):
+                raise SearchUnavailable(str(e)) from e
+            raise
+
+    async def _acall(self, func, *args, **kwargs):
+        from opensearchpy.exceptions import NotFoundError
+        from .opensearch_client import CircuitOpenError, acall_with_retries, _is_failure
+        try:
+            return await acall_with_retries(func, *args, **kwargs)
+        except NotFoundError:
+            if 'pit' in kwargs.get('body', {}):
+                raise InvalidCursor('Cursor expired.')
+            raise
+        except CircuitOpenError as e:
+            raise SearchUnavailable(str(e)) from e
+        except Exception as e:
+            if _is_failure(e):
+                raise SearchUnavailable(str(e)) from e
+            raise
+
+    # Release a finished point-in-time instead of waiting for keep_alive. The page
+    # is already built, so a failure here is logged rather than raised.
+    def _release_pit(self, pit_id):
+        from opensearchpy.exceptions import TransportError
+        try:
+            self._call(self.client.delete_pit, body={'pit_id': [pit_id]}, ignore=[404], retries=0)
+        except (SearchUnavailable, TransportError) as e:
+            logger.warning(f"Failed to release point-in-time: {e}")
+
+    async def _arelease_pit(self, client, pit_id):
+        from opensearchpy.exceptions import TransportError
+        try:
+            await self._acall(client.delete_pit, body={'pit_id': [pit_id]}, ignore=[404], retries=0)
+        except (SearchUnavailable, TransportError) as e:
+            logger.warning(f"Failed to release point-in-time: {e}")
+
+    def search(self, query, filters, page=1, page_size=20, cursor=None, use_cursor=False,
+               track_total_hits=True, facets=False, hydrate=False, sort=SORT_RELEVANCE, fields=None):
+        body = self._body(query, filters, page, page_size, use_cursor, track_total_hits, facets, hydrate, sort, fields)
+        pit_id = None
+        if use_cursor:
+            data = decode_cursor(cursor_tag(self.name, sort), cursor) if cursor else {}
+            pit_id = data.get('pit') or self._call(
+                self.client.create_pit, index=self.index, params={'keep_alive': PIT_KEEP_ALIVE}
+            )['pit_id']
+            self._apply_cursor(body, pit_id, data)
+            resp = self._call(self.client.search, body=body)
+        else:
+            resp = self._call(self.client.search, index=self.index, body=body)
+
+        result = self._result(resp, page_size, use_cursor, facets, pit_id, sort, fields)
+        job_ids = result.pop('ids')
+        if hydrate:
+            result['results'] = hydrate_jobs(job_ids, fields)
+        if use_cursor and not result['next_cursor']:
+            self._release_pit(resp.get('pit_id', pit_id))
+        return result
+
+    async def asearch(self, query, filters, page=1, page_size=20, cursor=None, use_cursor=False,
+                      track_total_hits=True, facets=False, hydrate=False, sort=SORT_RELEVANCE, fields=None):
+        from asgiref.sync import sync_to_async
+        from .opensearch_client import get_async_opensearch_client
+        client = get_async_opensearch_client()
+        body = self._body(query, filters, page, page_size, use_cursor, track_total_hits, facets, hydrate, sort, fields)
+        pit_id = None
+        if use_cursor:
+            data = decode_cursor(cursor_tag(self.name, sort), cursor) if cursor else {}
+            if not data.get('pit'):
+                pit = await self._acall(client.create_pit, index=self.index, params={'keep_alive': PIT_KEEP_ALIVE})
+            pit_id = data.get('pit') or pit['pit_id']
+            self._apply_cursor(body, pit_id, data)
+            resp = await self._acall(client.search, body=body)
+        else:
+            resp = await self._acall(client.search, index=self.index, body=body)
+
+        result = self._result(resp, page_size, use_cursor, facets, pit_id, sort, fields)
+        job_ids = result.pop('ids')
+        if hydrate:
+            result['results'] = await sync_to_async(hydrate_jobs)(job_ids, fields)
+        if use_cursor and not result['next_cursor']:
+            await self._arelease_pit(client, resp.get('pit_id', pit_id))
+        return result
+
+    def autocomplete(self, query, size=5, timeout=None):
+        body = {
+            "query": {
+                "multi_match": {
+                    "query": query,
+                    "fields": ["title.autocomplete^2", "company.autocomplete"],
+                    "operator": "and"
+                }
+            },
+            "size": size,
+            "_source": ["id", "title", "company"],
+        }
+        kwargs = {}
+        if timeout:
+            body["timeout"] = f"{int(timeout * 1000)}ms"
+            kwargs['request_timeout'] = timeout
+        # Within a tight budget a retry would only make the answer later
+        resp = self._call(self.client.search, index=self.index, body=body, retries=0, **kwargs)
+        return [hit['_source'] for hit in resp['hits']['hits']]
+
+    # Index changes are shipped asynchronously through the outbox
+    def job_saved(self, job):
+        from .index_outbox import enqueue_job_change
+        enqueue_job_change(job.id, JobIndexOutbox.OP_INDEX)
+
+    def job_deleted(self, job_id):
+        from .index_outbox import enqueue_job_change
+        enqueue_job_change(job_id, JobIndexOutbox.OP_DELETE)
+
+    # The worker reindexes the whole document, which carries the new count (sort=popular)
+    def application_counts_changed(self, job_ids):
+        from .index_outbox import enqueue_job_changes
+        enqueue_job_changes(job_ids, JobIndexOutbox.OP_INDEX)
+
+
+# PostgreSQL full-text search over Job.search_vector, which a trigger keeps
+# up to date (title A, company/tags B, description C) and a GIN index serves.
+
+class PostgresSearchBackend(SearchBackend):
+    name = 'postgres'
+    config = 'english'
+
+    def search_query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+        return SearchQuery(query, search_type='websearch', config=self.config)
+
+    def filtered_queryset(self, query, filters):
+        jobs = Job.objects.all()
+        if query.strip():
+            jobs = jobs.filter(search_vector=self.search_query(query))
+        if filters.get('employment_type'):
+            jobs = jobs.filter(employment_type__in=filters['employment_type'])
+        if filters.get('location'):
+            jobs = jobs.filter(location__in=filters['location'])
+        if filters.get('tags'):
+            any_tag = Q()
+            for tag in filters['tags']:
+                any_tag |= Q(tags__contains=[tag])
+            jobs = jobs.filter(any_tag)
+        if filters.get('created_after'):
+            jobs = jobs.filter(created_at__gte=filters['created_after'])
+        if filters.get('created_before'):
+            jobs = jobs.filter(created_at__lte=filters['created_before'])
+        return jobs
+
+    def count(self, jobs, track_total_hits):
+        if track_total_hits is False:
+            return None, None
+        if track_total_hits is True:
+            return jobs.count(), 'eq'
+        total = jobs.order_by()[:track_total_hits + 1].count()
+        if total > track_total_hits:
+            return track_total_hits, 'gte'
+        return total, 'eq'
+
+    def facets(self, jobs):
+        facets = {}
+        for name in ('employment_type', 'location'):
+            rows = jobs.values(name).annotate(count=Count('id')).order_by('-count', name)[:FACET_SIZES[name]]
+            facets[name] = [{'value': row[name], 'count': row['count']} for row in rows]
+        ids_sql, params = jobs.values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tag, COUNT(*) AS n FROM {Job._meta.db_table}, jsonb_array_elements_text(tags) AS tag "
+                f"WHERE id IN ({ids_sql}) GROUP BY tag ORDER BY n DESC, tag LIMIT %s",
+                [*params, FACET_SIZES['tags']],
+            )
+            facets['tags'] = [{'value': tag, 'count': count} for tag, count in cursor.fetchall()]
+        return facets
+
+    def search(self, query, filters, page=1, page_size=20, cursor=None, use_cursor=False,
+               track_total_hits=True, facets=False, hydrate=False, sort=SORT_RELEVANCE, fields=None):
+        from django.contrib.postgres.search import SearchRank
+        from django.db.models import DecimalField, FloatField, Value
+        from django.db.models.functions import Cast
+        jobs = self.filtered_queryset(query, filters)
+        result = {'facets': self.facets(jobs) if facets else None, 'next_cursor': None}
+        result['total'], result['total_relation'] = self.count(jobs, track_total_hits)
+
+        # `rank` is the sort key: text relevance, or the application count for popular
+        if sort == SORT_POPULAR:
+            jobs = jobs.annotate(rank=F('application_count'))
+        elif query.strip():
+            # ts_rank returns float4; a fixed-scale numeric sorts the same way and round-trips
+            # through the cursor exactly, so rows tied at a page boundary are neither skipped nor repeated
+            rank = SearchRank(F('search_vector'), self.search_query(query))
+            jobs = jobs.annotate(rank=Cast(rank, DecimalField(max_digits=20, decimal_places=12)))
+        else:
+            jobs = jobs.annotate(rank=Value(0.0, output_field=FloatField()))
+        jobs = jobs.order_by('-rank', 'id')
+        if use_cursor:
+            data = decode_cursor(cursor_tag(self.name, sort), cursor) if cursor else {}
+            if data.get('after'):
+                rank, job_id = data['after']
+                jobs = jobs.filter(Q(rank__lt=rank) | Q(rank=rank, id__gt=job_id))
+            page_jobs = list(job_values(jobs, fields, extra=('rank', 'id'))[:page_size])
+            if len(page_jobs) == page_size:
+                last = page_jobs[-1]
+                result['next_cursor'] = encode_cursor(cursor_tag(self.name, sort), after=[str(last.rank), last.id])
+        else:
+            offset = (page - 1) * page_size
+            page_jobs = list(job_values(jobs, fields, extra=('rank', 'id'))[offset:offset + page_size])
+        result['results'] = job_rows_to_data(page_jobs, fields)
+        return result
+
+    def autocomplete(self, query, size=5, timeout=None):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        # Prefix-match every word; tokens are reduced to \w+ so nothing is parsed as tsquery syntax
+        words = re.findall(r'\w+', query.lower())
+        if not words:
+            return []
+        search_query = SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=self.config)
+        jobs = (
+            Job.objects.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', 'id')
+            .values('id', 'title', 'company')[:size]
+        )
+        return list(jobs)
+
+
+# Tries the primary backend and falls back to the secondary one when it raises
+# (cluster down, timeouts). Cursors are tagged per backend: a cursor the fallback
+# issued keeps paging on the fallback, so a scroll that started during an outage
+# finishes there; a new search goes back to the primary.
+
+class FailoverSearchBackend(SearchBackend):
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = primary.name
+
+    def _call(self, method, *args, **kwargs):
+        try:
+            return getattr(self.primary, method)(*args, **kwargs)
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            logger.warning(f"Search backend {self.primary.name} failed, using {self.fallback.name}: {e}")
+            return getattr(self.fallback, method)(*args, **kwargs)
+
+    def _issued_by_fallback(self, kwargs):
+        cursor = kwargs.get('cursor')
+        return bool(cursor) and cursor_backend(cursor) == self.fallback.name
+
+    def search(self, *args, **kwargs):
+        if self._issued_by_fallback(kwargs):
+            return self.fallback.search(*args, **kwargs)
+        return self._call('search', *args, **kwargs)
+
+    async def asearch(self, *args, **kwargs):
+        if self._issued_by_fallback(kwargs):
+            return await self.fallback.asearch(*args, **kwargs)
+        try:
+            return await self.primary.asearch(*args, **kwargs)
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            logger.warning(f"Search backend {self.primary.name} failed, using {self.fallback.name}: {e}")
+            return await self.fallback.asearch(*args, **kwargs)
+
+    def autocomplete(self, *args, **kwargs):
+        return self._call('autocomplete', *args, **kwargs)
+
+    def job_saved(self, job):
+        self.primary.job_saved(job)
+        self.fallback.job_saved(job)
+
+    def job_deleted(self, job_id):
+        self.primary.job_deleted(job_id)
+        self.fallback.job_deleted(job_id)
+
+    def application_counts_changed(self, job_ids):
+        self.primary.application_counts_changed(job_ids)
+        self.fallback.application_counts_changed(job_ids)
+
+
+def load_backend(name):
+    return import_string(BACKENDS.get(name, name))()
+
+
+_backend = None
+
+
+# The configured backend (SEARCH_BACKEND, optionally wrapped with SEARCH_FALLBACK_BACKEND)
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        backend = load_backend(getattr(settings, 'SEARCH_BACKEND', 'opensearch'))
+        fallback = getattr(settings, 'SEARCH_FALLBACK_BACKEND', '')
+        if fallback:
+            backend = FailoverSearchBackend(backend, load_backend(fallback))
+        _backend = backend
+    return _backend
@@ -1,23 +1,135 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from .fast_serializers import snippet_source
 from .models_job import Job
 from .opensearch_client import get_opensearch_client
 
-INDEX_NAME = 'job-index'
+logger = logging.getLogger(__name__)
 
-# Index or update a job document in OpenSearch
+INDEX_NAME = 'job-index'  # Alias that readers and the outbox worker use
+INDEX_REPLICAS = int(getattr(settings, 'SEARCH_INDEX_REPLICAS', 1))
+INDEX_REFRESH_INTERVAL = getattr(settings, 'SEARCH_INDEX_REFRESH_INTERVAL', '1s')
 
-def index_job(job: Job):
-    client = get_opensearch_client()
-    doc = {
+INDEX_TEMPLATE_NAME = 'job-index-template'
+
+# Prefix matching is done with edge n-grams at index time, so queries never
+# need leading wildcards. Applied to every job-index* index via a template.
+_KEYWORD = {'type': 'keyword', 'ignore_above': 256}
+_AUTOCOMPLETE = {'type': 'text', 'analyzer': 'autocomplete', 'search_analyzer': 'autocomplete_search'}
+INDEX_SETTINGS = {
+    'analysis': {
+        'filter': {
+            'autocomplete_edge_ngram': {'type': 'edge_ngram', 'min_gram': 1, 'max_gram': 20},
+        },
+        'analyzer': {
+            'autocomplete': {
+                'type': 'custom',
+                'tokenizer': 'standard',
+                'filter': ['lowercase', 'asciifolding', 'autocomplete_edge_ngram'],
+            },
+            'autocomplete_search': {
+                'type': 'custom',
+                'tokenizer': 'standard',
+                'filter': ['lowercase', 'asciifolding'],
+            },
+        },
+    },
+}
+INDEX_MAPPINGS = {
+    'properties': {
+        'id': {'type': 'long'},
+        'title': {'type': 'text', 'fields': {'keyword': _KEYWORD, 'autocomplete': _AUTOCOMPLETE}},
+        'company': {'type': 'text', 'fields': {'keyword': _KEYWORD, 'autocomplete': _AUTOCOMPLETE}},
+        'description': {'type': 'text'},
+        # Start of the description that search results cut description_snippet from; not searchable
+        'description_prefix': {'type': 'text', 'index': False},
+        'location': {'type': 'text', 'fields': {'keyword': _KEYWORD}},
+        'tags': {'type': 'text', 'fields': {'keyword': _KEYWORD, 'autocomplete': _AUTOCOMPLETE}},
+        'employment_type': {'type': 'text', 'fields': {'keyword': _KEYWORD}},
+        'created_at': {'type': 'date'},
+        'updated_at': {'type': 'date'},
+        'version': {'type': 'long'},
+        'application_count': {'type': 'integer'},
+    },
+}
+
+def ensure_index_template(client):
+    client.indices.put_index_template(name=INDEX_TEMPLATE_NAME, body={
+        'index_patterns': [f'{INDEX_NAME}*'],
+        'template': {'settings': INDEX_SETTINGS, 'mappings': INDEX_MAPPINGS},
+    })
+
+
+_template_installed = False
+_template_lock = threading.Lock()
+
+
+# Incremental writers (outbox worker, sync_search_index, index_job) call this before
+# their first write in a process. When no reindex has run yet, that write auto-creates
+# the index, and only the template gives it the analyzers and .autocomplete subfields.
+
+def ensure_index_template_once(client):
+    global _template_installed
+    if not _template_installed:
+        with _template_lock:
+            if not _template_installed:
+                ensure_index_template(client)
+                _template_installed = True
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Integer document version (updated_at in epoch milliseconds), compared by the reconciliation pass
+
+def document_version(updated_at):
+    return (updated_at - EPOCH) // timedelta(milliseconds=1)
+
+# Build the OpenSearch document for a job
+
+def job_to_document(job: Job):
+    return {
         'id': job.id,
         'title': job.title,
         'company': job.company,
         'description': job.description,
+        'description_prefix': snippet_source(job.description),
         'location': job.location,
         'tags': job.tags,
         'employment_type': job.employment_type,
+        'application_count': job.application_count,
         'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat(),
+        'version': document_version(job.updated_at),
+    }
+
+# Bulk API actions for indexing or removing a job
+
+def index_action(job: Job, index=INDEX_NAME):
+    return {
+        '_op_type': 'index',
+        '_index': index,
+        '_id': job.id,
+        '_source': job_to_document(job),
+    }
+
+def delete_action(job_id, index=INDEX_NAME):
+    return {
+        '_op_type': 'delete',
+        '_index': index,
+        '_id': job_id,
     }
-    client.index(index=INDEX_NAME, id=job.id, body=doc)
+
+# Index or update a job document in OpenSearch
+
+def index_job(job: Job):
+    client = get_opensearch_client()
+    ensure_index_template_once(client)
+    client.index(index=INDEX_NAME, id=job.id, body=job_to_document(job))
 
 # Remove a job from the index
 
@@ -25,34 +137,96 @@ def delete_job_from_index(job_id):
     client = get_opensearch_client()
     client.delete(index=INDEX_NAME, id=job_id, ignore=[404])
 
-# Bulk reindex all jobs (for initial setup or reindexing)
-def reindex_all_jobs():
-    import logging
-    logger = logging.getLogger(__name__)
+# Full rebuilds load a new versioned index (job-index-<timestamp>) and then
+# atomically point the INDEX_NAME alias at it, so readers never see a
+# half-built index.
+
+def new_index_name():
+    return f"{INDEX_NAME}-{timezone.now():%Y%m%d%H%M%S}"
+
+def create_load_index(client, index):
+    # Refresh off and no replicas while loading; restored by finish_load_index
+    client.indices.create(index=index, body={
+        'settings': {'index': {'refresh_interval': '-1', 'number_of_replicas': 0}},
+    })
+
+def finish_load_index(client, index, replicas=None):
+    replicas = INDEX_REPLICAS if replicas is None else replicas
+    client.indices.put_settings(index=index, body={
+        'index': {'refresh_interval': INDEX_REFRESH_INTERVAL, 'number_of_replicas': replicas},
+    })
+    client.indices.refresh(index=index)
+
+# Point INDEX_NAME at `index` in one _aliases call; returns the indices it replaced
+
+def swap_alias(client, index):
+    actions = []
+    old_indices = []
+    if client.indices.exists_alias(name=INDEX_NAME):
+        old_indices = [name for name in client.indices.get_alias(name=INDEX_NAME) if name != index]
+        actions += [{'remove': {'index': name, 'alias': INDEX_NAME}} for name in old_indices]
+    elif client.indices.exists(index=INDEX_NAME):
+        # Legacy deployments wrote into a concrete index called INDEX_NAME; drop it
+        # in the same request so the alias can take over its name.
+        actions.append({'remove_index': {'index': INDEX_NAME}})
+    actions.append({'add': {'index': index, 'alias': INDEX_NAME}})
+    client.indices.update_aliases(body={'actions': actions})
+    return old_indices
+
+def iter_job_actions(index, chunk_size=500):
+    # Server-side cursor: memory stays flat however large the catalog is
+    for job in Job.objects.order_by('id').iterator(chunk_size=chunk_size):
+        yield index_action(job, index=index)
+
+# Bulk reindex all jobs into a fresh index and swap the alias over to it
+
+def reindex_all_jobs(chunk_size=500, thread_count=1, replicas=None, delete_old=True, allow_errors=False):
+    from opensearchpy.helpers import streaming_bulk, parallel_bulk
+    from .search_sync import reconcile, set_watermark, sync_changes
     client = get_opensearch_client()
-    jobs = Job.objects.all()
-    logger.info(f"Reindexing {jobs.count()} jobs to OpenSearch...")
-    actions = [
-        {
-            '_op_type': 'index',
-            '_index': INDEX_NAME,
-            '_id': job.id,
-            '_source': {
-                'id': job.id,
-                'title': job.title,
-                'company': job.company,
-                'description': job.description,
-                'location': job.location,
-                'tags': job.tags,
-                'employment_type': job.employment_type,
-                'created_at': job.created_at.isoformat(),
-            }
-        }
-        for job in jobs
-    ]
-    from opensearchpy.helpers import bulk
-    try:
-        success, errors = bulk(client, actions, stats_only=True)
-        logger.info(f"Bulk index result: {success} successes, {errors} errors")
-    except Exception as e:
-        logger.error(f"Bulk indexing failed: {e}")
+    index = new_index_name()
+    load_started = timezone.now()
+    logger.info(f"Reindexing jobs into {index}...")
+    ensure_index_template(client)
+    create_load_index(client, index)
+
+    actions = iter_job_actions(index, chunk_size)
+    if thread_count > 1:
+        results = parallel_bulk(client, actions, thread_count=thread_count, chunk_size=chunk_size, raise_on_error=False)
+    else:
+        results = streaming_bulk(client, actions, chunk_size=chunk_size, raise_on_error=False)
+    started = time.monotonic()
+    success, errors = 0, 0
+    for ok, item in results:
+        if ok:
+            success += 1
+        else:
+            errors += 1
+            logger.warning(f"Failed to index job: {item}")
+    elapsed = time.monotonic() - started
+    if errors and not allow_errors:
+        # Leave the live alias alone rather than serve an incomplete index
+        client.indices.delete(index=index, ignore=[404])
+        raise RuntimeError(f"{errors} jobs failed to index into {index}; alias not switched")
+
+    finish_load_index(client, index, replicas)
+    old_indices = swap_alias(client, index)
+    # Catch up on jobs written while the load was running
+    set_watermark(index, load_started)
+    sync_changes(index, chunk_size)
+    # Jobs deleted during the load were removed from the old index only. Deletes
+    # after the swap reach this index through the alias, so one checksum pass now
+    # drops the rest.
+    client.indices.refresh(index=index)
+    reconciled = reconcile(index)
+    if delete_old and old_indices:
+        client.indices.delete(index=','.join(old_indices), ignore=[404])
+    logger.info(f"Bulk index result: {success} successes, {errors} errors in {elapsed:.1f}s")
+    return {
+        'index': index,
+        'success': success,
+        'errors': errors,
+        'seconds': elapsed,
+        'replaced': old_indices,
+        'reconciled': reconciled['repaired'],
+    }
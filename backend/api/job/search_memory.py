@@ -0,0 +1,508 @@
+import bisect
+import logging
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models_job import Job, JobChange
+from .search_backends import (
+    FACET_SIZES, RESULT_FIELDS, SORT_POPULAR, SORT_RELEVANCE, SearchBackend, cursor_tag, decode_cursor,
+    encode_cursor, hydrate_jobs,
+)
+from .fast_serializers import select_fields
+
+logger = logging.getLogger(__name__)
+
+# Same weighting as the OpenSearch multi_match (title^3, company^2)
+FIELD_BOOSTS = {
+    'title': 3.0,
+    'company': 2.0,
+    'description': 1.0,
+    'location': 1.0,
+    'tags': 1.0,
+    'employment_type': 1.0,
+}
+AUTOCOMPLETE_FIELDS = ('title', 'company')
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Rebuild the base segment once this share of doc slots are tombstones
+COMPACT_RATIO = 0.2
+SNAPSHOT_VERSION = 3
+
+SNAPSHOT_PATH = getattr(settings, 'SEARCH_MEMORY_SNAPSHOT', os.path.join(settings.BASE_DIR, 'search_memory.snapshot'))
+# How often a process checks Postgres for changes made by other processes
+REFRESH_INTERVAL = float(getattr(settings, 'SEARCH_MEMORY_REFRESH_SECONDS', 5))
+# Rows can commit with an updated_at slightly older than the watermark, so refreshes re-read a short window
+REFRESH_OVERLAP = timedelta(seconds=60)
+# An index that has not refreshed for longer than the JobChange log is kept compares ids with the table instead
+CHANGE_RETENTION = timedelta(seconds=float(getattr(settings, 'SEARCH_MEMORY_CHANGE_RETENTION', 86400)))
+PRUNE_INTERVAL = 3600
+
+_TOKEN_RE = re.compile(r'\w+')
+_datetime_field = serializers.DateTimeField()
+
+
+def tokenize(value):
+    if isinstance(value, list):
+        value = ' '.join(str(v) for v in value)
+    return _TOKEN_RE.findall(str(value or '').lower())
+
+
+# Postings for one field. The base segment is CSR-style: every term maps to an
+# (offset, count) slice of two flat arrays of doc slots and term frequencies.
+# Documents added since the last compaction go to small per-term delta arrays.
+# Slots only ever grow, so both segments stay sorted by slot.
+
+class FieldIndex:
+
+    def __init__(self):
+        self.terms = {}
+        self.slots = array('I')
+        self.freqs = array('I')
+        self.delta = {}
+        self.lengths = array('I')
+        self.total_length = 0
+        self._vocabulary = None
+
+    def add(self, slot, tokens):
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        for term, tf in Counter(tokens).items():
+            postings = self.delta.get(term)
+            if postings is None:
+                postings = self.delta[term] = (array('I'), array('I'))
+                self._vocabulary = None
+            postings[0].append(slot)
+            postings[1].append(tf)
+
+    def remove(self, slot):
+        self.total_length -= self.lengths[slot]
+
+    # Move the delta postings into the flat base arrays
+    def freeze(self):
+        merged = defaultdict(lambda: (array('I'), array('I')))
+        for term, (offset, count) in self.terms.items():
+            merged[term][0].extend(self.slots[offset:offset + count])
+            merged[term][1].extend(self.freqs[offset:offset + count])
+        for term, (slots, freqs) in self.delta.items():
+            merged[term][0].extend(slots)
+            merged[term][1].extend(freqs)
+        self.terms, self.slots, self.freqs, self.delta = {}, array('I'), array('I'), {}
+        for term, (slots, freqs) in merged.items():
+            self.terms[term] = (len(self.slots), len(slots))
+            self.slots.extend(slots)
+            self.freqs.extend(freqs)
+
+    def postings(self, term):
+        base = self.terms.get(term)
+        if base:
+            offset, count = base
+            yield from zip(self.slots[offset:offset + count], self.freqs[offset:offset + count])
+        delta = self.delta.get(term)
+        if delta:
+            yield from zip(delta[0], delta[1])
+
+    def doc_frequency(self, term):
+        base = self.terms.get(term)
+        delta = self.delta.get(term)
+        return (base[1] if base else 0) + (len(delta[0]) if delta else 0)
+
+    def terms_with_prefix(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.terms.keys() | self.delta.keys())
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+
+
+# BM25-scored inverted index over the Job table, held in process memory
+
+class InMemoryJobIndex:
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self._reset()
+        self.watermark = None
+        # JobChange entries up to this time have been applied
+        self.changes_since = None
+        self.last_refresh = 0.0
+        self.last_prune = 0.0
+
+    def _reset(self):
+        self.fields = {name: FieldIndex() for name in FIELD_BOOSTS}
+        self.docs = []           # slot -> serialized job (same shape as JobSerializer)
+        self.created = []        # slot -> created_at, for range filters
+        self.updated = []        # slot -> updated_at, to skip unchanged rows on refresh
+        self.slot_by_id = {}
+        self.deleted = set()
+
+    @property
+    def live_count(self):
+        return len(self.docs) - len(self.deleted)
+
+    def _append(self, doc, created_at, updated_at):
+        slot = len(self.docs)
+        self.docs.append(doc)
+        self.created.append(created_at)
+        self.updated.append(updated_at)
+        self.slot_by_id[doc['id']] = slot
+        for name, field in self.fields.items():
+            field.add(slot, tokenize(doc.get(name)))
+
+    def add(self, doc, created_at, updated_at):
+        with self.lock:
+            slot = self.slot_by_id.get(doc['id'])
+            # A refresh can bring rows read before a newer local save
+            if slot is not None and self.updated[slot] >= updated_at:
+                return
+            self._remove(doc['id'])
+            self._append(doc, created_at, updated_at)
+            # An update leaves the job's old slot behind as a tombstone
+            self._maybe_compact()
+
+    def remove(self, job_id):
+        with self.lock:
+            self._remove(job_id)
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if len(self.deleted) > COMPACT_RATIO * max(len(self.docs), 1):
+            self.compact()
+
+    def _remove(self, job_id):
+        slot = self.slot_by_id.pop(job_id, None)
+        if slot is not None:
+            self.deleted.add(slot)
+            for field in self.fields.values():
+                field.remove(slot)
+
+    # Renumber live documents into a fresh base segment
+    def compact(self):
+        with self.lock:
+            live = [
+                (doc, self.created[slot], self.updated[slot])
+                for slot, doc in enumerate(self.docs) if slot not in self.deleted
+            ]
+            self._reset()
+            for doc, created_at, updated_at in live:
+                self._append(doc, created_at, updated_at)
+            for field in self.fields.values():
+                field.freeze()
+
+    def _rows(self, jobs):
+        for row in jobs.values(*RESULT_FIELDS, 'updated_at').iterator(chunk_size=2000):
+            updated_at = row.pop('updated_at')
+            created_at = row['created_at']
+            row['created_at'] = _datetime_field.to_representation(created_at)
+            yield row, created_at, updated_at
+
+    def _add_rows(self, rows):
+        for row, created_at, updated_at in rows:
+            self.add(row, created_at, updated_at)
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+
+    def build(self):
+        with self.lock:
+            self._reset()
+            self.watermark = None
+            self.changes_since = timezone.now()
+            self._add_rows(self._rows(Job.objects.order_by('id')))
+            for field in self.fields.values():
+                field.freeze()
+            self.last_refresh = time.monotonic()
+
+    # Jobs deleted and current application counts of jobs whose count changed since
+    # the last refresh, from the JobChange log. Entries are re-read over
+    # REFRESH_OVERLAP (applying one twice is harmless), since one can commit a
+    # little after its created_at. When the log no longer reaches back that far,
+    # ids and counts are compared with the whole table instead.
+    def _changes(self, now):
+        if self.changes_since is None or self.changes_since < now - CHANGE_RETENTION + REFRESH_OVERLAP:
+            counts = dict(Job.objects.values_list('id', 'application_count'))
+            with self.lock:
+                return [job_id for job_id in self.slot_by_id if job_id not in counts], counts
+        deleted, counted = [], set()
+        changes = JobChange.objects.filter(created_at__gt=self.changes_since - REFRESH_OVERLAP)
+        for job_id, op in changes.values_list('job_id', 'op'):
+            (deleted.append if op == JobChange.OP_DELETE else counted.add)(job_id)
+        counts = dict(Job.objects.filter(id__in=counted).values_list('id', 'application_count')) if counted else {}
+        return deleted, counts
+
+    def _set_counts(self, counts):
+        for job_id, count in counts.items():
+            slot = self.slot_by_id.get(job_id)
+            if slot is not None and self.docs[slot]['application_count'] != count:
+                # Stored docs are never modified in place (see query())
+                self.docs[slot] = dict(self.docs[slot], application_count=count)
+
+    # Pick up writes made by other processes: rows updated past the watermark, and
+    # deletions and count changes from the JobChange log. One thread refreshes at a time, and it
+    # queries Postgres before taking the index lock, so concurrent searches keep
+    # using the index as it is instead of waiting.
+    def refresh(self, force=False):
+        if not force and time.monotonic() - self.last_refresh < REFRESH_INTERVAL:
+            return
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.last_refresh = time.monotonic()
+            now = timezone.now()
+            jobs = Job.objects.all()
+            if self.watermark is not None:
+                jobs = jobs.filter(updated_at__gt=self.watermark - REFRESH_OVERLAP)
+            rows = list(self._rows(jobs))
+            deleted, counts = self._changes(now)
+            with self.lock:
+                self._add_rows(rows)
+                self._set_counts(counts)
+                for job_id in deleted:
+                    self._remove(job_id)
+                self._maybe_compact()
+                self.changes_since = now
+            if time.monotonic() - self.last_prune > PRUNE_INTERVAL:
+                self.last_prune = time.monotonic()
+                JobChange.objects.filter(created_at__lt=now - CHANGE_RETENTION).delete()
+        finally:
+            self.refresh_lock.release()
+
+    def score(self, tokens):
+        scores = defaultdict(float)
+        total_docs = max(self.live_count, 1)
+        for name, boost in FIELD_BOOSTS.items():
+            field = self.fields[name]
+            avg_length = field.total_length / total_docs or 1.0
+            for term in set(tokens):
+                df = field.doc_frequency(term)
+                if not df:
+                    continue
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                for slot, tf in field.postings(term):
+                    if slot in self.deleted:
+                        continue
+                    norm = 1 - BM25_B + BM25_B * field.lengths[slot] / avg_length
+                    scores[slot] += boost * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return scores
+
+    def matches(self, doc, created_at, filters):
+        for name in ('employment_type', 'location'):
+            if filters.get(name) and doc[name] not in filters[name]:
+                return False
+        if filters.get('tags') and not set(filters['tags']) & set(doc['tags'] or []):
+            return False
+        if filters.get('created_after') and created_at < _as_datetime(filters['created_after'], created_at):
+            return False
+        if filters.get('created_before') and created_at > _as_datetime(filters['created_before'], created_at):
+            return False
+        return True
+
+    # Matching (score, job id, doc) tuples, best first. Docs are returned rather than
+    # slots because compaction renumbers slots as soon as the lock is released;
+    # stored docs are never modified, so they are safe to read afterwards.
+    def query(self, query, filters):
+        tokens = tokenize(query)
+        with self.lock:
+            if tokens:
+                candidates = self.score(tokens).items()
+            else:
+                candidates = ((slot, 0.0) for slot in range(len(self.docs)) if slot not in self.deleted)
+            hits = [
+                (score, self.docs[slot]['id'], self.docs[slot]) for slot, score in candidates
+                if self.matches(self.docs[slot], self.created[slot], filters)
+            ]
+        hits.sort(key=lambda hit: (-hit[0], hit[1]))
+        return hits
+
+    def autocomplete(self, query, size):
+        words = tokenize(query)
+        if not words:
+            return []
+        with self.lock:
+            scores = defaultdict(float)
+            for name in AUTOCOMPLETE_FIELDS:
+                field = self.fields[name]
+                # Every word must match: complete words exactly, the last one as a prefix
+                matched = None
+                for i, word in enumerate(words):
+                    terms = field.terms_with_prefix(word) if i == len(words) - 1 else [word]
+                    slots = {slot for term in terms for slot, _ in field.postings(term)}
+                    matched = slots if matched is None else matched & slots
+                for slot in matched - self.deleted:
+                    scores[slot] += FIELD_BOOSTS[name]
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], self.docs[item[0]]['id']))[:size]
+            return [
+                {key: self.docs[slot][key] for key in ('id', 'title', 'company')}
+                for slot, _ in ranked
+            ]
+
+    def save(self, path=SNAPSHOT_PATH):
+        with self.lock:
+            self.compact()
+            state = {
+                'version': SNAPSHOT_VERSION,
+                'watermark': self.watermark,
+                'changes_since': self.changes_since,
+                'docs': self.docs,
+                'created': self.created,
+                'updated': self.updated,
+                'fields': {
+                    name: (field.terms, field.slots, field.freqs, field.lengths, field.total_length)
+                    for name, field in self.fields.items()
+                },
+            }
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    # Snapshots are written by `build_search_snapshot` on this host; only load trusted files
+    def load(self, path=SNAPSHOT_PATH):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {state.get('version')}")
+        with self.lock:
+            self._reset()
+            self.docs = state['docs']
+            self.created = state['created']
+            self.updated = state['updated']
+            self.slot_by_id = {doc['id']: slot for slot, doc in enumerate(self.docs)}
+            for name, (terms, slots, freqs, lengths, total_length) in state['fields'].items():
+                field = self.fields[name]
+                field.terms, field.slots, field.freqs = terms, slots, freqs
+                field.lengths, field.total_length = lengths, total_length
+            self.watermark = state['watermark']
+            self.changes_since = state['changes_since']
+            self.last_refresh = 0.0
+
+
+def _as_datetime(value, reference):
+    # Date-only filters compare against midnight in the stored timezone
+    if hasattr(value, 'hour'):
+        return value if value.tzinfo else value.replace(tzinfo=reference.tzinfo)
+    return datetime(value.year, value.month, value.day, tzinfo=reference.tzinfo)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# Process-wide index: loaded from the snapshot when present, otherwise built from Postgres
+
+def get_memory_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = InMemoryJobIndex()
+                try:
+                    index.load()
+                    logger.info(f"Loaded search snapshot with {index.live_count} jobs")
+                except FileNotFoundError:
+                    index.build()
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable search snapshot: {e}")
+                    index.build()
+                _index = index
+    return _index
+
+
+class MemorySearchBackend(SearchBackend):
+    name = 'memory'
+
+    def __init__(self, index=None):
+        self._index = index
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = get_memory_index()
+        return self._index
+
+    def search(self, query, filters, page=1, page_size=20, cursor=None, use_cursor=False,
+               track_total_hits=True, facets=False, hydrate=False, sort=SORT_RELEVANCE, fields=None):
+        self.index.refresh()
+        hits = self.index.query(query, filters)
+        if sort == SORT_POPULAR:
+            # The application count takes the score's place in the hit tuple (and the cursor)
+            hits = [(doc['application_count'], job_id, doc) for _, job_id, doc in hits]
+            hits.sort(key=lambda hit: (-hit[0], hit[1]))
+        result = {'facets': None, 'next_cursor': None}
+
+        total = len(hits)
+        if track_total_hits is False:
+            result['total'], result['total_relation'] = None, None
+        elif track_total_hits is not True and total > track_total_hits:
+            result['total'], result['total_relation'] = track_total_hits, 'gte'
+        else:
+            result['total'], result['total_relation'] = total, 'eq'
+
+        if facets:
+            counts = {name: Counter() for name in FACET_SIZES}
+            for _, _, doc in hits:
+                counts['employment_type'][doc['employment_type']] += 1
+                counts['location'][doc['location']] += 1
+                counts['tags'].update(doc['tags'] or [])
+            result['facets'] = {
+                name: [{'value': value, 'count': count} for value, count in counts[name].most_common(size)]
+                for name, size in FACET_SIZES.items()
+            }
+
+        if use_cursor:
+            data = decode_cursor(cursor_tag(self.name, sort), cursor) if cursor else {}
+            if data.get('after'):
+                score, job_id = data['after']
+                start = bisect.bisect_right([(-hit[0], hit[1]) for hit in hits], (-score, job_id))
+            else:
+                start = 0
+            page_hits = hits[start:start + page_size]
+            if len(page_hits) == page_size:
+                result['next_cursor'] = encode_cursor(cursor_tag(self.name, sort), after=list(page_hits[-1][:2]))
+        else:
+            offset = (page - 1) * page_size
+            page_hits = hits[offset:offset + page_size]
+
+        if hydrate:
+            result['results'] = hydrate_jobs([job_id for _, job_id, _ in page_hits], fields)
+        else:
+            result['results'] = [select_fields(doc, fields) for _, _, doc in page_hits]
+        return result
+
+    def autocomplete(self, query, size=5, timeout=None):
+        self.index.refresh()
+        return self.index.autocomplete(query, size)
+
+    # Apply the change in this process once the write commits; other
+    # processes pick it up through refresh() (deletions and counts through the
+    # JobChange log). An index that has not been loaded yet will see the change when it builds.
+    def job_saved(self, job):
+        if self._index is None and _index is None:
+            return
+
+        def apply():
+            doc = {field: getattr(job, field) for field in RESULT_FIELDS}
+            doc['created_at'] = _datetime_field.to_representation(job.created_at)
+            self.index.add(doc, job.created_at, job.updated_at)
+        transaction.on_commit(apply)
+
+    def job_deleted(self, job_id):
+        JobChange.objects.create(job_id=job_id, op=JobChange.OP_DELETE)
+        if self._index is None and _index is None:
+            return
+        transaction.on_commit(lambda: self.index.remove(job_id))
+
+    # Every process, this one included, reads the new counts on its next refresh
+    def application_counts_changed(self, job_ids):
+        JobChange.objects.bulk_create(JobChange(job_id=job_id, op=JobChange.OP_COUNT) for job_id in job_ids)
@@ -0,0 +1,165 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+
+from .models_job import Job, SearchSyncCheckpoint
+from .opensearch_client import get_opensearch_client
+from .response_cache import invalidate_jobs
+from .search_indexing import INDEX_NAME, index_action, delete_action, document_version, ensure_index_template_once
+
+logger = logging.getLogger(__name__)
+
+# Rows can commit with an updated_at slightly older than the current watermark
+# (auto_now is set before the transaction commits), so each run re-reads a
+# short overlap window. Re-indexing a document is idempotent.
+SYNC_OVERLAP = timedelta(seconds=int(getattr(settings, 'SEARCH_SYNC_OVERLAP_SECONDS', 60)))
+
+# Version sums are compared as OpenSearch doubles; 4096 docs of epoch-ms
+# versions stay below 2**53, so block checksums remain exact.
+MAX_BLOCK_SIZE = 4096
+
+
+def resolve_index(client, index=INDEX_NAME):
+    # The checkpoint belongs to the concrete index behind the alias, so a rebuilt index starts fresh
+    if client.indices.exists_alias(name=index):
+        return next(iter(client.indices.get_alias(name=index)))
+    return index
+
+
+def get_watermark(index):
+    checkpoint = SearchSyncCheckpoint.objects.filter(index_name=index).first()
+    return checkpoint.watermark if checkpoint else None
+
+
+def set_watermark(index, watermark):
+    SearchSyncCheckpoint.objects.update_or_create(index_name=index, defaults={'watermark': watermark})
+
+
+def _ship(client, actions, chunk_size=500):
+    from opensearchpy.helpers import streaming_bulk
+    ensure_index_template_once(client)
+    success, errors = 0, 0
+    for ok, item in streaming_bulk(client, actions, chunk_size=chunk_size, raise_on_error=False):
+        op_type, info = next(iter(item.items()))
+        if ok or (op_type == 'delete' and info.get('status') == 404):
+            success += 1
+        else:
+            errors += 1
+            logger.warning(f"Failed to sync job: {item}")
+    return success, errors
+
+
+# Push jobs changed since the index's watermark and advance it
+
+def sync_changes(index=None, chunk_size=500):
+    client = get_opensearch_client()
+    index = index or resolve_index(client)
+    watermark = get_watermark(index)
+    jobs = Job.objects.order_by('updated_at', 'id')
+    if watermark is not None:
+        jobs = jobs.filter(updated_at__gt=watermark - SYNC_OVERLAP)
+
+    latest = {'updated_at': watermark}
+
+    def actions():
+        for job in jobs.iterator(chunk_size=chunk_size):
+            latest['updated_at'] = job.updated_at
+            yield index_action(job, index=index)
+
+    success, errors = _ship(client, actions(), chunk_size)
+    if success:
+        invalidate_jobs()
+    # Only move forward when everything landed, otherwise the next run retries the same window
+    if not errors and latest['updated_at'] is not None and latest['updated_at'] != watermark:
+        set_watermark(index, latest['updated_at'])
+    logger.info(f"Synced {success} changed jobs to {index} ({errors} errors)")
+    return {'index': index, 'success': success, 'errors': errors, 'watermark': latest['updated_at']}
+
+
+def _db_blocks(block_size):
+    sql = (
+        f"SELECT id / %s AS block, COUNT(*), SUM(FLOOR(EXTRACT(EPOCH FROM updated_at) * 1000))::bigint "
+        f"FROM {Job._meta.db_table} GROUP BY block"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [block_size])
+        return {int(block): (count, int(checksum)) for block, count, checksum in cursor.fetchall()}
+
+
+def _index_blocks(client, index, block_size):
+    blocks = {}
+    body = {
+        'size': 0,
+        'aggs': {
+            'blocks': {
+                'composite': {
+                    'size': 1000,
+                    'sources': [{'block': {'histogram': {'field': 'id', 'interval': block_size}}}],
+                },
+                'aggs': {'checksum': {'sum': {'field': 'version'}}},
+            },
+        },
+    }
+    while True:
+        agg = client.search(index=index, body=body)['aggregations']['blocks']
+        for bucket in agg['buckets']:
+            block = int(bucket['key']['block']) // block_size
+            blocks[block] = (bucket['doc_count'], int(bucket['checksum']['value']))
+        if 'after_key' not in agg or not agg['buckets']:
+            return blocks
+        body['aggs']['blocks']['composite']['after'] = agg['after_key']
+
+
+def _repair_actions(client, index, block, block_size):
+    low, high = block * block_size, (block + 1) * block_size
+    db_versions = {
+        job_id: document_version(updated_at)
+        for job_id, updated_at in Job.objects.filter(id__gte=low, id__lt=high).values_list('id', 'updated_at')
+    }
+    resp = client.search(index=index, body={
+        'query': {'range': {'id': {'gte': low, 'lt': high}}},
+        'size': block_size,
+        '_source': ['version'],
+    })
+    index_versions = {int(hit['_id']): hit['_source'].get('version') for hit in resp['hits']['hits']}
+
+    stale = [job_id for job_id, version in db_versions.items() if index_versions.get(job_id) != version]
+    jobs = Job.objects.in_bulk(stale)
+    actions = [index_action(jobs[job_id], index=index) for job_id in stale if job_id in jobs]
+    actions += [delete_action(job_id, index=index) for job_id in index_versions if job_id not in db_versions]
+    return actions
+
+
+# Compare per-block (count, sum of versions) between Postgres and the index,
+# then fetch and repair only the blocks that differ
+
+def reconcile(index=None, block_size=1000):
+    block_size = min(block_size, MAX_BLOCK_SIZE)
+    client = get_opensearch_client()
+    index = index or resolve_index(client)
+    db_blocks = _db_blocks(block_size)
+    index_blocks = _index_blocks(client, index, block_size)
+    mismatched = sorted(
+        block for block in db_blocks.keys() | index_blocks.keys()
+        if db_blocks.get(block) != index_blocks.get(block)
+    )
+    repaired, errors = 0, 0
+    for block in mismatched:
+        actions = _repair_actions(client, index, block, block_size)
+        if actions:
+            success, failed = _ship(client, actions)
+            repaired += success
+            errors += failed
+    logger.info(
+        f"Reconciled {index}: {len(db_blocks)} blocks checked, {len(mismatched)} differed, "
+        f"{repaired} documents repaired ({errors} errors)"
+    )
+    return {
+        'index': index,
+        'blocks': len(db_blocks),
+        'mismatched': len(mismatched),
+        'repaired': repaired,
+        'errors': errors,
+    }
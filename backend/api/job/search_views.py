@@ -1,53 +1,198 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views import View
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from .opensearch_client import get_opensearch_client
-from .serializers_job import JobSerializer
-from .models_job import Job
+from rest_framework.renderers import BrowsableAPIRenderer
+from api.renderers import FastJSONRenderer
+from .fast_serializers import parse_fields
+from .response_cache import CACHE_ENABLED, SEARCH_CACHE_TTL, cache_job_response, cache_lookup, cache_store
+from .search_backends import FILTER_FIELDS, SORT_RELEVANCE, SORTS, InvalidCursor, SearchUnavailable, get_search_backend
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Offset paging makes the engine sort from+size hits; deeper pages must use the cursor
+MAX_RESULT_WINDOW = 10000
+# Totals are counted exactly up to this many hits unless the caller asks for total=exact
+TOTAL_HITS_CAP = int(getattr(settings, 'SEARCH_TRACK_TOTAL_HITS', 1000))
+
+
+def _truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def _int_param(value, default, minimum=1, maximum=None):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    value = max(value, minimum)
+    return min(value, maximum) if maximum else value
+
+
+def _track_total_hits(value):
+    if value == 'exact':
+        return True
+    if value in ('none', 'false', '0'):
+        return False
+    return TOTAL_HITS_CAP
+
+
+def _list_param(params, name):
+    # Accepts repeated (?tags=a&tags=b) and comma-separated (?tags=a,b) values
+    values = []
+    for value in params.getlist(name):
+        values += [part.strip() for part in value.split(',') if part.strip()]
+    return values
+
+
+def _date_param(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value) or parse_date(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+# Backend-neutral filters from the query string. Raises ValueError for malformed dates.
+
+def parse_filters(params):
+    filters = {name: _list_param(params, name) for name in FILTER_FIELDS}
+    filters['created_after'] = _date_param(params.get('created_after'))
+    filters['created_before'] = _date_param(params.get('created_before'))
+    return filters
+
+
+class BadSearchRequest(Exception):
+    pass
+
+
+# Turn query parameters into search() keyword arguments. Raises BadSearchRequest.
+
+def parse_search_request(params):
+    page = _int_param(params.get('page'), 1)
+    page_size = _int_param(params.get('page_size'), DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+    # Cursor mode: start with paginate=cursor, then pass back next_cursor
+    cursor = params.get('cursor')
+    use_cursor = bool(cursor) or params.get('paginate') == 'cursor'
+    try:
+        filters = parse_filters(params)
+    except ValueError as e:
+        raise BadSearchRequest(f'Invalid date: {e}')
+    sort = params.get('sort') or SORT_RELEVANCE
+    if sort not in SORTS:
+        raise BadSearchRequest(f"Unknown sort '{sort}'; use one of: {', '.join(SORTS)}.")
+    try:
+        fields = parse_fields(params.get('fields'))
+    except ValueError as e:
+        raise BadSearchRequest(str(e))
+    if not use_cursor and page * page_size > MAX_RESULT_WINDOW:
+        raise BadSearchRequest(f'Results beyond {MAX_RESULT_WINDOW} require cursor pagination (paginate=cursor).')
+    return {
+        'query': params.get('q', ''),
+        'filters': filters,
+        'page': page,
+        'page_size': page_size,
+        'cursor': cursor,
+        'use_cursor': use_cursor,
+        'track_total_hits': _track_total_hits(params.get('total')),
+        # Facet counts come back with the first page in the same round trip
+        'facets': _truthy(params.get('facets', 'true')) and not cursor,
+        # OpenSearch results come straight from _source unless the caller asks for Postgres hydration
+        'hydrate': _truthy(params.get('hydrate', '')),
+        # sort=popular orders by application count
+        'sort': sort,
+        # Sparse fieldset, e.g. fields=id,title,company,description_snippet
+        'fields': fields,
+    }
+
+
+def search_response_data(search, result):
+    data = {
+        'results': result['results'],
+        'total': result['total'],
+        'total_relation': result['total_relation'],
+        'page_size': search['page_size'],
+    }
+    if search['facets']:
+        data['facets'] = result['facets']
+    if search['use_cursor']:
+        data['next_cursor'] = result['next_cursor']
+    else:
+        data['page'] = search['page']
+    return data
+
+
+SEARCH_UNAVAILABLE = 'Search is temporarily unavailable.'
+
 
 class JobSearchView(APIView):
     permission_classes = [AllowAny]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    @cache_job_response('job-search', ttl=SEARCH_CACHE_TTL)
+    def get(self, request):
+        try:
+            search = parse_search_request(request.query_params)
+            result = get_search_backend().search(**search)
+        except (BadSearchRequest, InvalidCursor) as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SearchUnavailable:
+            return Response({'detail': SEARCH_UNAVAILABLE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(search_response_data(search, result))
+
+
+# Same endpoint as JobSearchView as a native async view, so under ASGI an
+# in-flight search does not hold a worker thread (enabled with SEARCH_ASYNC).
+# All search endpoints are public, so no DRF authentication is needed here.
+
+class AsyncJobSearchView(View):
+
+    async def get(self, request):
+        if CACHE_ENABLED:
+            key, data = await sync_to_async(cache_lookup)('job-search', {}, request.GET)
+            if data is not None:
+                response = JsonResponse(data)
+                response['X-Cache'] = 'HIT'
+                return response
+        try:
+            search = parse_search_request(request.GET)
+            result = await get_search_backend().asearch(**search)
+        except (BadSearchRequest, InvalidCursor) as e:
+            return JsonResponse({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SearchUnavailable:
+            return JsonResponse({'detail': SEARCH_UNAVAILABLE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        data = search_response_data(search, result)
+        response = JsonResponse(data)
+        if CACHE_ENABLED:
+            cache_store(key, data, ttl=SEARCH_CACHE_TTL)
+            response['X-Cache'] = 'MISS'
+        return response
+
+
+AUTOCOMPLETE_MAX_SIZE = 10
+# Suggestions are dropped rather than delayed once the budget is spent
+AUTOCOMPLETE_TIMEOUT = float(getattr(settings, 'SEARCH_AUTOCOMPLETE_TIMEOUT', 0.2))
+
+
+class JobAutocompleteView(APIView):
+    permission_classes = [AllowAny]
 
     def get(self, request):
-        query = request.query_params.get('q', '')
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
-        client = get_opensearch_client()
-        # Use wildcard and fuzziness for partial and typo-tolerant matches
-        body = {
-            "query": {
-                "bool": {
-                    "should": [
-                        {
-                            "multi_match": {
-                                "query": query,
-                                "fields": ["title^3", "company^2", "description", "location", "tags", "employment_type"],
-                                "fuzziness": "AUTO"
-                            }
-                        },
-                        {
-                            "query_string": {
-                                "query": f"*{query}*",
-                                "fields": ["title", "company", "description", "location", "tags", "employment_type"],
-                                "analyze_wildcard": True
-                            }
-                        }
-                    ]
-                }
-            },
-            "from": (page - 1) * page_size,
-            "size": page_size
-        }
-        resp = client.search(index='job-index', body=body)
-        job_ids = [int(hit['_id']) for hit in resp['hits']['hits']]
-        jobs = Job.objects.filter(id__in=job_ids)
-        # preserve order
-        jobs_dict = {job.id: job for job in jobs}
-        jobs_ordered = [jobs_dict[jid] for jid in job_ids if jid in jobs_dict]
-        serializer = JobSerializer(jobs_ordered, many=True)
-        return Response({
-            'results': serializer.data,
-            'total': resp['hits']['total']['value'],
-            'page': page,
-            'page_size': page_size
-        })
+        from opensearchpy.exceptions import TransportError
+        query = request.query_params.get('q', '').strip()
+        size = _int_param(request.query_params.get('size'), 5, maximum=AUTOCOMPLETE_MAX_SIZE)
+        if not query:
+            return Response({'results': []})
+        # Suggestions are best effort: an unavailable or slow cluster yields none
+        # (TransportError includes ConnectionError and timeouts); anything else is a bug
+        try:
+            results = get_search_backend().autocomplete(query, size, timeout=AUTOCOMPLETE_TIMEOUT)
+        except (SearchUnavailable, TransportError):
+            results = []
+        return Response({'results': results})
@@ -1,12 +1,28 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models_job import Job
-from .search_indexing import index_job, delete_job_from_index
+from .models_job import Job, JobApplication
+from .response_cache import invalidate_jobs
+from .search_backends import get_search_backend
+
+# The search backend decides how to pick up the change; OpenSearch writes an
+# outbox row (drained by `manage.py run_index_worker`) instead of calling the
+# cluster inside the request.
 
 @receiver(post_save, sender=Job)
 def index_job_on_save(sender, instance, **kwargs):
-    index_job(instance)
+    get_search_backend().job_saved(instance)
+    invalidate_jobs()
 
 @receiver(post_delete, sender=Job)
 def delete_job_on_delete(sender, instance, **kwargs):
-    delete_job_from_index(instance.id)
+    get_search_backend().job_deleted(instance.id)
+    invalidate_jobs()
+
+# Withdrawn applications change the job's application_count (count trigger); the
+# search backend re-reads the count it sorts popular results by. Applications are
+# created through apply_to_job(), which does the same on its own. Counts do not
+# invalidate cached job responses (see README, Application counts).
+
+@receiver(post_delete, sender=JobApplication)
+def application_count_on_delete(sender, instance, **kwargs):
+    get_search_backend().application_counts_changed([instance.job_id])
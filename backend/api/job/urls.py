@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import path
-from .views_job import JobListCreateView, JobRetrieveUpdateDestroyView, ApplyJobView, JobApplicantsListView
-from .search_views import JobSearchView
+from .views_job import JobListCreateView, JobRetrieveUpdateDestroyView, ApplyJobView, JobApplicantsListView, JobApplicantsExportView, JobCacheStatsView
+from .search_views import JobSearchView, AsyncJobSearchView, JobAutocompleteView
 
 urlpatterns = [
     path('jobs/', JobListCreateView.as_view(), name='job-list-create'),
     path('jobs/<int:pk>/', JobRetrieveUpdateDestroyView.as_view(), name='job-detail'),
     path('jobs/<int:job_id>/apply/', ApplyJobView.as_view(), name='job-apply'),
     path('jobs/<int:job_id>/applicants/', JobApplicantsListView.as_view(), name='job-applicants'),
-    path('jobs/search/', JobSearchView.as_view(), name='job-search'),
+    path('jobs/<int:job_id>/applicants/export/', JobApplicantsExportView.as_view(), name='job-applicants-export'),
+    path('jobs/search/', (AsyncJobSearchView if settings.SEARCH_ASYNC else JobSearchView).as_view(), name='job-search'),
+    path('jobs/autocomplete/', JobAutocompleteView.as_view(), name='job-autocomplete'),
+    path('jobs/cache/stats/', JobCacheStatsView.as_view(), name='job-cache-stats'),
 ]
@@ -1,32 +1,76 @@
-from rest_framework import generics, status, pagination
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from api.job.models_job import Job, JobApplication
 from api.user.models_user import User
-from api.serializers import JobSerializer, JobApplicationSerializer
+from .serializers_job import JobSerializer, JobApplicationSerializer
 from api.permissions import IsAdminUserType, IsUserUserType, IsAdminOrReadOnly
+from api.renderers import FastJSONRenderer
+from .apply import CV_NOT_FOUND, DUPLICATE, JOB_NOT_FOUND, REPLAYED, apply_to_job
+from .exports import EXPORT_FORMATS
+from .fast_serializers import job_rows_to_data, job_values, parse_fields
+from .conditional import (
+    conditional_job_response, job_list_etag, job_list_last_modified, job_detail_etag, job_detail_last_modified,
+)
+from .pagination import ApplicantPagination, JobPagination
+from .response_cache import cache_job_response, cache_stats
 
 
 # Job List & Create (Admin can create, all can list) with pagination
-class JobPagination(pagination.PageNumberPagination):
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
 class JobListCreateView(generics.ListCreateAPIView):
-    queryset = Job.objects.all().order_by('-created_at')
+    # id breaks created_at ties, so pages are stable and keyset pagination works
+    queryset = Job.objects.all().order_by('-created_at', '-id')
     serializer_class = JobSerializer
     permission_classes = [IsAdminOrReadOnly]
     pagination_class = JobPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    # auth, list validators (2), cache generation, count, page
+    query_budget = {'GET': 6}
+
+    @conditional_job_response(job_list_etag, job_list_last_modified)
+    @cache_job_response('job-list')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    # Read-only fast path: value rows instead of model instances and ModelSerializer.
+    # ?fields= narrows the SELECT to the requested columns.
+    def list(self, request, *args, **kwargs):
+        try:
+            fields = parse_fields(request.query_params.get('fields'))
+        except ValueError as e:
+            raise ValidationError({'fields': [str(e)]})
+        # created_at and id are always read: the keyset cursor is built from them
+        queryset = job_values(self.filter_queryset(self.get_queryset()), fields, extra=('created_at', 'id'))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(job_rows_to_data(page, fields))
+        return Response(job_rows_to_data(queryset, fields))
 
 # Job Retrieve/Update/Delete (Admin only for update/delete)
 class JobRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsAdminOrReadOnly]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    # auth, detail validator, cache generation, row
+    query_budget = {'GET': 4}
+
+    @conditional_job_response(job_detail_etag, job_detail_last_modified)
+    @cache_job_response('job-detail')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        row = generics.get_object_or_404(job_values(self.get_queryset()), pk=kwargs['pk'])
+        return Response(job_rows_to_data([row])[0])
 
-# Apply to Job (USER only, must be logged in)
+# Apply to Job (USER only, must be logged in). One SQL statement checks the job and CV,
+# inserts the application and detects duplicates. Sending an Idempotency-Key header makes
+# retries safe: a repeat of the request that created the application gets the same 201.
 class ApplyJobView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -34,30 +78,78 @@ class ApplyJobView(APIView):
         user = request.user
         if getattr(user, 'user_type', None) != 'USER':
             return Response({'detail': 'Only users with USER role can apply.'}, status=status.HTTP_403_FORBIDDEN)
-        try:
-            job = Job.objects.get(pk=job_id)
-        except Job.DoesNotExist:
-            return Response({'detail': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
-        # Prevent duplicate applications
-        if JobApplication.objects.filter(user=user, job=job).exists():
-            return Response({'detail': 'You have already applied to this job.'}, status=status.HTTP_400_BAD_REQUEST)
-        cv_id = request.data.get('cv_id')
-        note = request.data.get('note', '')
-        cv = None
-        if cv_id:
-            from api.user.models_user import UserCV
+        cv_id = request.data.get('cv_id') or None
+        note = str(request.data.get('note') or '')
+        idempotency_key = request.headers.get('Idempotency-Key', '')
+        if cv_id is not None:
             try:
-                cv = UserCV.objects.get(id=cv_id, user=user)
-            except UserCV.DoesNotExist:
+                cv_id = int(cv_id)
+            except (TypeError, ValueError):
                 return Response({'detail': 'CV not found or does not belong to user.'}, status=status.HTTP_400_BAD_REQUEST)
-        application = JobApplication.objects.create(user=user, job=job, cv=cv, note=note)
-        return Response(JobApplicationSerializer(application).data, status=status.HTTP_201_CREATED)
+        if len(note) > 500:
+            return Response({'detail': 'Note must be at most 500 characters.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(idempotency_key) > 255:
+            return Response({'detail': 'Idempotency-Key must be at most 255 characters.'}, status=status.HTTP_400_BAD_REQUEST)
 
-# List applicants for a job (Admin only)
+        outcome, application = apply_to_job(user, job_id, cv_id=cv_id, note=note, idempotency_key=idempotency_key)
+        if outcome == JOB_NOT_FOUND:
+            return Response({'detail': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if outcome == CV_NOT_FOUND:
+            return Response({'detail': 'CV not found or does not belong to user.'}, status=status.HTTP_400_BAD_REQUEST)
+        if outcome == DUPLICATE:
+            return Response({'detail': 'You have already applied to this job.'}, status=status.HTTP_400_BAD_REQUEST)
+        response = Response(JobApplicationSerializer(application).data, status=status.HTTP_201_CREATED)
+        if outcome == REPLAYED:
+            response['Idempotent-Replayed'] = 'true'
+        return response
+
+# Applications for a job with only the columns JobApplicationSerializer reads
+def applicants_queryset(job_id):
+    return (
+        JobApplication.objects.filter(job_id=job_id)
+        .select_related('user', 'job', 'cv')
+        .only(
+            'id', 'user_id', 'job_id', 'cv_id', 'note', 'applied_at',
+            'user__email', 'user__first_name', 'user__last_name', 'user__contact_number',
+            'job__title', 'cv__file_url', 'cv__file_name',
+        )
+        .order_by('-applied_at', '-id')
+    )
+
+# List applicants for a job (Admin only), paginated
 class JobApplicantsListView(generics.ListAPIView):
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAdminUserType]
+    pagination_class = ApplicantPagination
+    # auth, count, page (user, job and cv joined in)
+    query_budget = 3
 
     def get_queryset(self):
-        job_id = self.kwargs['job_id']
-        return JobApplication.objects.filter(job_id=job_id)
+        return applicants_queryset(self.kwargs['job_id'])
+
+
+# Stream every applicant for a job as CSV (default) or NDJSON (?output=ndjson), Admin only.
+# `format` is reserved by DRF for renderer selection, hence `output`.
+class JobApplicantsExportView(APIView):
+    permission_classes = [IsAdminUserType]
+
+    def get(self, request, job_id):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {'detail': f"Unknown output '{output}'; use one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Job.objects.filter(pk=job_id).exists():
+            return Response({'detail': 'Job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        content_type, rows = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(rows(applicants_queryset(job_id)), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="job-{job_id}-applicants.{output}"'
+        return response
+
+# Response cache hit/miss/eviction counters for this process (Admin only)
+class JobCacheStatsView(APIView):
+    permission_classes = [IsAdminUserType]
+
+    def get(self, request):
+        return Response(cache_stats())
@@ -0,0 +1,288 @@
+import json
+import math
+import os
+import random
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from api import s3
+from api.authentication import UserRefreshToken
+from api.job import response_cache, search_backends
+from api.job.models_job import Job
+from api.job.search_memory import MemorySearchBackend
+from api.query_budget import capture_queries
+from api.seed_data import ANCHOR, CATALOG_SPAN, SEED_PASSWORD, BenchmarkDataset, seeded_users
+from api.user.models_user import User, UserCV
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, 'benchmarks', 'endpoints.json')
+# A run fails when an endpoint's p95 grows past the baseline by more than this share
+DEFAULT_THRESHOLD = 0.25
+ADMIN_EMAIL = 'bench-admin@example.com'
+APPLICANT_EMAIL = 'bench-applicant@example.com'
+# The apply benchmark applies to jobs of its own, created and removed by each run,
+# so the seeded catalog's application counts and updated_at stay as seeded
+APPLY_JOB_COMPANY = 'Benchmark Apply Targets'
+ENDPOINTS = ('login', 'job-list', 'job-detail', 'search', 'apply', 'applicants', 'cvs')
+# Status a successful request returns; anything else counts as an error
+EXPECTED_STATUS = {'apply': 201}
+
+
+def percentile(sorted_values, share):
+    # Nearest-rank percentile
+    return sorted_values[max(math.ceil(share * len(sorted_values)) - 1, 0)]
+
+
+# No network: search is answered by the in-memory backend instead of OpenSearch,
+# and CV links are signed by a boto3 client with dummy credentials (presigning
+# is computed locally, the endpoint is never contacted).
+def use_local_stand_ins():
+    import boto3
+    search_backends._backend = MemorySearchBackend()
+    s3._client = boto3.client(
+        's3', aws_access_key_id='benchmark', aws_secret_access_key='benchmark',
+        region_name=s3.AWS_REGION, endpoint_url='http://localhost:9000',
+    )
+
+
+def bearer(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(user).access_token}'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the real API routes (login, job list/detail, search, apply, applicants, CV list) against a "
+        "seed_benchmark_data catalog with N concurrent clients. Reports latency percentiles, throughput and "
+        "queries per request, and fails when an endpoint regresses past the JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='Comma-separated subset to run.')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads per endpoint.')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per endpoint.')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='The seed_benchmark_data seed; also picks ids, pages and search terms.')
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file.')
+        parser.add_argument('--save-baseline', action='store_true', help='Write this run as the new baseline.')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help='Allowed p95 growth over the baseline (0.25 = 25%%), unless the baseline sets one.')
+        parser.add_argument('--response-cache', action='store_true',
+                            help='Keep the job response cache on (off by default, so every request does the work).')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(names) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}. Choose from: {', '.join(ENDPOINTS)}")
+        if settings.DEBUG:
+            self.stderr.write('DEBUG is on: Django keeps every query in memory and timings will be inflated.')
+        if not seeded_users().exists() or not Job.objects.exists():
+            raise CommandError('No benchmark data; run `manage.py seed_benchmark_data` first.')
+
+        use_local_stand_ins()
+        response_cache.CACHE_ENABLED = options['response_cache']
+        rng = random.Random(options['seed'])
+        total = options['warmup'] + options['requests']
+        self.applicant = User.objects.get_or_create(email=APPLICANT_EMAIL, defaults={'user_type': 'USER'})[0]
+        self.admin = User.objects.get_or_create(email=ADMIN_EMAIL, defaults={'user_type': 'ADMIN'})[0]
+        self.authorized = []
+        try:
+            apply_jobs = self.create_apply_jobs(total) if 'apply' in names else []
+            plans = self.plans(names, rng, total, options['seed'], apply_jobs)
+            results = {}
+            for name in names:
+                self.refresh_tokens()
+                results[name] = self.run(name, plans[name], options['warmup'], options['concurrency'])
+        finally:
+            # Cascades to the applications the apply benchmark created
+            Job.objects.filter(company=APPLY_JOB_COMPANY).delete()
+            self.applicant.delete()
+            self.admin.delete()
+
+        self.report(results)
+        failures = self.compare(results, options)
+        if options['save_baseline']:
+            if any(result['errors'] for result in results.values()):
+                failures.append('baseline not saved: the run had failed requests')
+            else:
+                self.save_baseline(results, options)
+        if failures:
+            raise CommandError('Regressions:\n  ' + '\n  '.join(failures))
+
+    # One job per apply request (an applicant applies to a job once), dated before the
+    # seeded catalog so job lists never reach them. bulk_create sends no post_save, so
+    # nothing is queued for indexing. Also clears what an interrupted run left behind.
+    def create_apply_jobs(self, count):
+        Job.objects.filter(company=APPLY_JOB_COMPANY).delete()
+        jobs = Job.objects.bulk_create(
+            Job(
+                title=f'Benchmark apply target {number}', company=APPLY_JOB_COMPANY,
+                description='Target of the apply benchmark.', location='Remote', employment_type='Full-time',
+            )
+            for number in range(count)
+        )
+        dated = ANCHOR - CATALOG_SPAN - timedelta(days=1)
+        Job.objects.filter(company=APPLY_JOB_COMPANY).update(created_at=dated, updated_at=dated)
+        return [job.id for job in jobs]
+
+    # Headers for requests as `user`. The token is minted by refresh_tokens() right
+    # before each endpoint runs, since a whole run can outlast ACCESS_TOKEN_LIFETIME.
+    def authorize(self, user):
+        headers = {}
+        self.authorized.append((user, headers))
+        return headers
+
+    def refresh_tokens(self):
+        for user, headers in self.authorized:
+            headers.update(bearer(user))
+
+    # Request specs per endpoint: (method, path, data, headers)
+    def plans(self, names, rng, total, seed, apply_jobs):
+        job_ids = list(Job.objects.exclude(company=APPLY_JOB_COMPANY).values_list('id', flat=True))
+        user = seeded_users().order_by('id').first()
+        cv_owner_id = UserCV.objects.filter(user__in=seeded_users()).values_list('user_id', flat=True).first()
+        cv_owner = User.objects.get(id=cv_owner_id) if cv_owner_id else user
+        popular = list(Job.objects.order_by('-application_count').values_list('id', flat=True)[:50])
+        # Search terms drawn from the seeded catalog's vocabulary (same seed as seed_benchmark_data)
+        queries = BenchmarkDataset(seed=seed, jobs=1, users=0, applications=0).queries(total)
+        pages = max(min(len(job_ids) // 20, 50), 1)
+        applicant_auth, admin_auth, cv_owner_auth = map(self.authorize, (self.applicant, self.admin, cv_owner))
+        builders = {
+            'login': lambda i: ('post', '/api/login/', {'email': user.email, 'password': SEED_PASSWORD}, {}),
+            'job-list': lambda i: ('get', '/api/jobs/', {'page': rng.randint(1, pages)}, {}),
+            'job-detail': lambda i: ('get', f'/api/jobs/{rng.choice(job_ids)}/', None, {}),
+            'search': lambda i: ('get', '/api/jobs/search/', {'q': queries[i]}, {}),
+            'apply': lambda i: (
+                'post', f'/api/jobs/{apply_jobs[i % len(apply_jobs)]}/apply/', {'note': 'benchmark'},
+                applicant_auth,
+            ),
+            'applicants': lambda i: ('get', f'/api/jobs/{rng.choice(popular)}/applicants/', None, admin_auth),
+            'cvs': lambda i: ('get', '/api/me/cvs/', None, cv_owner_auth),
+        }
+        return {name: [builders[name](i) for i in range(total)] for name in names}
+
+    def send(self, client, spec):
+        method, path, data, headers = spec
+        if method == 'post':
+            return client.post(path, data, content_type='application/json', **headers)
+        return client.get(path, data, **headers)
+
+    def run(self, name, specs, warmup, concurrency):
+        client = Client(raise_request_exception=False)
+        for spec in specs[:warmup]:
+            self.send(client, spec)
+        pending = iter(specs[warmup:])
+        lock = threading.Lock()
+        samples = []  # (ms, status, queries)
+
+        def worker():
+            thread_client = Client(raise_request_exception=False)
+            try:
+                while True:
+                    with lock:
+                        spec = next(pending, None)
+                    if spec is None:
+                        return
+                    with capture_queries() as log:
+                        started = time.perf_counter()
+                        response = self.send(thread_client, spec)
+                        elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        samples.append((elapsed, response.status_code, len(log)))
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies = sorted(sample[0] for sample in samples)
+        queries = [sample[2] for sample in samples]
+        expected = EXPECTED_STATUS.get(name, 200)
+        return {
+            'requests': len(samples),
+            'concurrency': concurrency,
+            'errors': sum(1 for sample in samples if sample[1] != expected),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'rps': round(len(samples) / wall, 1) if wall else 0.0,
+            'queries_p50': statistics.median(queries),
+            'queries_max': max(queries),
+        }
+
+    def report(self, results):
+        self.stdout.write(
+            f"{'endpoint':<12} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>8} {'queries':>9} {'errors':>7}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms "
+                f"{result['rps']:>8.1f} {result['queries_p50']:>4g}/{result['queries_max']:<4} {result['errors']:>7}"
+            )
+
+    def load_baseline(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    # Errors always fail. Against a baseline, p95 may grow by the endpoint's
+    # threshold and the worst-case query count may not grow at all.
+    def compare(self, results, options):
+        failures = [
+            f"{name}: {result['errors']} failed requests" for name, result in results.items() if result['errors']
+        ]
+        baseline = self.load_baseline(options['baseline'])
+        if baseline is None:
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline to record one.")
+            return failures
+        thresholds = baseline.get('thresholds', {})
+        for name, result in results.items():
+            before = baseline.get('endpoints', {}).get(name)
+            if before is None:
+                continue
+            threshold = thresholds.get(name, options['threshold'])
+            limit = before['p95_ms'] * (1 + threshold)
+            if result['p95_ms'] > limit:
+                failures.append(
+                    f"{name}: p95 {result['p95_ms']:.1f}ms > {limit:.1f}ms "
+                    f"(baseline {before['p95_ms']:.1f}ms + {threshold:.0%})"
+                )
+            if result['queries_max'] > before['queries_max']:
+                failures.append(
+                    f"{name}: up to {result['queries_max']} queries per request, baseline {before['queries_max']}"
+                )
+        if not failures:
+            self.stdout.write(self.style.SUCCESS(f"Within thresholds of {options['baseline']}"))
+        return failures
+
+    # Keeps any per-endpoint thresholds already in the file
+    def save_baseline(self, results, options):
+        baseline = self.load_baseline(options['baseline']) or {}
+        baseline.setdefault('thresholds', {})
+        baseline['endpoints'] = {**baseline.get('endpoints', {}), **results}
+        baseline['meta'] = {
+            'seed': options['seed'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'jobs': Job.objects.exclude(company=APPLY_JOB_COMPANY).count(),
+            'response_cache': options['response_cache'],
+        }
+        os.makedirs(os.path.dirname(options['baseline']) or '.', exist_ok=True)
+        with open(options['baseline'], 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(f"Baseline written to {options['baseline']}")
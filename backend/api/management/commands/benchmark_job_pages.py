@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.job.fast_serializers import job_rows_to_data, job_values
+from api.job.pagination import CURSOR_NAME, JobPagination
+from api.job.search_backends import encode_cursor
+from api.job.views_job import JobListCreateView
+
+DEFAULT_PAGES = '1,10,100,1000,10000'
+
+
+class Command(BaseCommand):
+    help = (
+        "Time /jobs/ pages at increasing depth with offset (?page=N) and keyset (?paginate=cursor) pagination. "
+        "Pagination and serialization are timed directly, without the response cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', default=DEFAULT_PAGES, help='Comma-separated page numbers to time.')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per page and mode.')
+
+    def fetch(self, params):
+        request = Request(APIRequestFactory().get('/api/jobs/', params))
+        paginator = JobPagination()
+        jobs = paginator.paginate_queryset(job_values(JobListCreateView.queryset.all()), request)
+        return paginator.get_paginated_response(job_rows_to_data(jobs))
+
+    def time_page(self, params, repeat):
+        self.fetch(params)  # warm-up
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            self.fetch(params)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        total = JobListCreateView.queryset.count()
+        self.stdout.write(f"{total} jobs, page size {page_size}")
+        self.stdout.write(f"{'page':>8} {'offset p50':>12} {'keyset p50':>12}")
+        for page in [int(value) for value in options['pages'].split(',') if value.strip()]:
+            if (page - 1) * page_size >= total:
+                self.stdout.write(f"{page:>8} skipped (catalog too small)")
+                continue
+            offset_ms = self.time_page({'page': page, 'page_size': page_size}, options['repeat'])
+
+            keyset_params = {'paginate': 'cursor', 'page_size': page_size}
+            if page > 1:
+                # Position the cursor on the last row of the previous page (this lookup is not timed)
+                created_at, job_id = JobListCreateView.queryset.values_list('created_at', 'id')[
+                    (page - 1) * page_size - 1
+                ]
+                keyset_params['cursor'] = encode_cursor(CURSOR_NAME, after=[created_at.isoformat(), job_id])
+            keyset_ms = self.time_page(keyset_params, options['repeat'])
+            self.stdout.write(f"{page:>8} {offset_ms:>10.1f}ms {keyset_ms:>10.1f}ms")
@@ -0,0 +1,53 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.job.fast_serializers import job_rows_to_data, job_values
+from api.job.models_job import Job
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import JobSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare serializing and rendering a page of jobs with JobSerializer + JSONRenderer against the "
+        "values_list fast path + FastJSONRenderer, and check both produce the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Jobs per payload.')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per path.')
+
+    def time_path(self, render, repeat):
+        render()  # warm-up
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        queryset = Job.objects.order_by('-created_at', '-id')[:options['limit']]
+        # Rows are fetched once so only serialization and rendering are timed
+        jobs = list(queryset)
+        rows = list(job_values(queryset))
+        if not jobs:
+            raise CommandError('No jobs to serialize.')
+
+        def model_path():
+            return JSONRenderer().render(JobSerializer(jobs, many=True).data)
+
+        def fast_path():
+            return FastJSONRenderer().render(job_rows_to_data(rows))
+
+        if model_path() != fast_path():
+            raise CommandError('Fast path output differs from JobSerializer + JSONRenderer.')
+
+        model_ms = self.time_path(model_path, options['repeat'])
+        fast_ms = self.time_path(fast_path, options['repeat'])
+        self.stdout.write(f"{len(jobs)} jobs, orjson {'installed' if orjson else 'not installed'}")
+        self.stdout.write(f"JobSerializer + JSONRenderer   p50 {model_ms:.2f}ms")
+        self.stdout.write(f"fast path + FastJSONRenderer   p50 {fast_ms:.2f}ms ({model_ms / fast_ms:.1f}x)")
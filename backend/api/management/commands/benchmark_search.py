@@ -0,0 +1,63 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.job.search_backends import BACKENDS, load_backend
+
+DEFAULT_QUERIES = ['python', 'engineer', 'remote', 'data', 'manager', 'frontend developer', 'sales', 'devops']
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "Run the same query set against several search backends and compare latency and top-N overlap."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', default='opensearch,postgres', help='Comma-separated backend names.')
+        parser.add_argument('--queries', help='File with one query per line (defaults to a built-in set).')
+        parser.add_argument('--repeat', type=int, default=5, help='Times each query is run per backend.')
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if options['queries']:
+            with open(options['queries']) as f:
+                queries = [line.strip() for line in f if line.strip()]
+        else:
+            queries = DEFAULT_QUERIES
+        names = [name.strip() for name in options['backends'].split(',') if name.strip()]
+        unknown = [name for name in names if name not in BACKENDS]
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(unknown)}")
+
+        top_ids = {}
+        for name in names:
+            backend = load_backend(name)
+            timings = []
+            top_ids[name] = {}
+            for query in queries:
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    result = backend.search(query, {}, page_size=options['page_size'], track_total_hits=False)
+                    timings.append((time.perf_counter() - started) * 1000)
+                top_ids[name][query] = [job['id'] for job in result['results']]
+            self.stdout.write(
+                f"{name:<12} n={len(timings)} mean={statistics.mean(timings):.1f}ms "
+                f"p50={_percentile(timings, 50):.1f}ms p95={_percentile(timings, 95):.1f}ms "
+                f"p99={_percentile(timings, 99):.1f}ms"
+            )
+
+        # How much the engines agree on the first page of results
+        for i, first in enumerate(names):
+            for second in names[i + 1:]:
+                overlaps = []
+                for query in queries:
+                    a, b = set(top_ids[first][query]), set(top_ids[second][query])
+                    if a or b:
+                        overlaps.append(len(a & b) / len(a | b))
+                if overlaps:
+                    self.stdout.write(f"{first} vs {second}: mean top-{options['page_size']} Jaccard overlap "
+                                      f"{statistics.mean(overlaps):.2f}")
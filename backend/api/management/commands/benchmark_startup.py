@@ -0,0 +1,93 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker does before it can answer its first request: configure Django,
+# populate the app registry and load the URLconf (which imports every view).
+BOOT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+# Only needed once a request actually talks to S3 or OpenSearch
+DEFAULT_FORBID = 'boto3,botocore,opensearchpy'
+
+
+# `-X importtime` lines look like "import time:  self |  cumulative | <indent>module".
+# Returns {module: (self_us, cumulative_us, depth)}.
+def parse_importtime(output):
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        modules[stripped.rstrip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: boot Django and load the URLconf in fresh interpreters with `python -X importtime`, "
+        "report the median time and the packages that take longest to import, and fail if a lazily imported package "
+        "(boto3, opensearchpy, ...) was imported during boot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start.')
+        parser.add_argument('--top', type=int, default=15, help='Packages to list.')
+        parser.add_argument('--forbid', default=DEFAULT_FORBID,
+                            help='Comma-separated packages that must not be imported at boot.')
+        parser.add_argument('--max-ms', type=float, help='Fail when the median boot takes longer than this.')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        walls, imports = [], []
+        for _ in range(max(options['runs'], 1)):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', BOOT],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            walls.append((time.perf_counter() - started) * 1000)
+            if result.returncode:
+                raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+            imports.append(parse_importtime(result.stderr))
+
+        # Self time summed per top-level package (so a package is charged for its own
+        # modules, not for whatever it happened to import first), median over the runs
+        packages = defaultdict(list)
+        for modules in imports:
+            totals = defaultdict(int)
+            for name, (self_us, _, _) in modules.items():
+                totals[name.split('.')[0]] += self_us
+            for package, total in totals.items():
+                packages[package].append(total)
+        import_ms = statistics.median(sum(m[0] for m in modules.values()) for modules in imports) / 1000
+        wall_ms = statistics.median(walls)
+
+        self.stdout.write(
+            f"Boot: {wall_ms:.0f}ms median over {len(walls)} runs "
+            f"(min {min(walls):.0f}ms, max {max(walls):.0f}ms), {import_ms:.0f}ms of it importing "
+            f"{len(imports[0])} modules"
+        )
+        ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+        for package, totals in ranked[:options['top']]:
+            self.stdout.write(f"  {statistics.median(totals) / 1000:8.1f}ms  {package}")
+
+        failures = []
+        forbidden = [name.strip() for name in options['forbid'].split(',') if name.strip()]
+        loaded = sorted({name for name in imports[0] if name.split('.')[0] in forbidden})
+        if loaded:
+            failures.append(f"imported at boot: {', '.join(sorted({name.split('.')[0] for name in loaded}))}")
+        if options['max_ms'] is not None and wall_ms > options['max_ms']:
+            failures.append(f"median boot {wall_ms:.0f}ms > {options['max_ms']:.0f}ms")
+        if failures:
+            raise CommandError('Cold start regressions:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('No forbidden imports at boot'))
@@ -0,0 +1,87 @@
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from api.authentication import UserRefreshToken
+from api.job.models_job import Job, JobApplication
+from api.user.models_user import User
+
+LOADTEST_EMAIL = 'loadtest-apply@example.com'
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent duplicate apply requests at one job (in-process, one DB connection per thread) and check "
+        "that exactly one application is created, retries with the same Idempotency-Key replay it, and nothing 5xxs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job-id', type=int, help='Job to apply to (defaults to the newest job).')
+        parser.add_argument('--concurrency', type=int, default=20, help='Threads submitting at the same moment.')
+        parser.add_argument('--rounds', type=int, default=5, help='Fresh apply races to run.')
+        parser.add_argument('--keep', action='store_true', help='Keep the load-test user and its application.')
+
+    def handle(self, *args, **options):
+        job = Job.objects.filter(pk=options['job_id']).first() if options['job_id'] else Job.objects.order_by('-id').first()
+        if job is None:
+            raise CommandError('No job to apply to.')
+        user, _ = User.objects.get_or_create(email=LOADTEST_EMAIL, defaults={'user_type': 'USER'})
+        token = str(UserRefreshToken.for_user(user).access_token)
+        url = f'/api/jobs/{job.id}/apply/'
+
+        statuses = Counter()
+        timings = []
+        failures = []
+        lock = threading.Lock()
+        for round_number in range(options['rounds']):
+            JobApplication.objects.filter(user=user, job=job).delete()
+            key = str(uuid.uuid4())
+            barrier = threading.Barrier(options['concurrency'])
+
+            def submit(index):
+                client = Client(raise_request_exception=False)
+                # Half the requests retry the same key; the other half are plain double taps
+                headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+                if index % 2 == 0:
+                    headers['HTTP_IDEMPOTENCY_KEY'] = key
+                try:
+                    barrier.wait()
+                    started = time.perf_counter()
+                    response = client.post(url, {'note': 'load test'}, content_type='application/json', **headers)
+                    with lock:
+                        timings.append((time.perf_counter() - started) * 1000)
+                        statuses[response.status_code] += 1
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=submit, args=(i,)) for i in range(options['concurrency'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            applications = JobApplication.objects.filter(user=user, job=job).count()
+            if applications != 1:
+                failures.append(f"round {round_number + 1}: {applications} applications")
+
+        self.stdout.write(
+            f"{options['rounds']} rounds x {options['concurrency']} concurrent requests to {url}: "
+            + ', '.join(f"{code}={count}" for code, count in sorted(statuses.items()))
+        )
+        if timings:
+            self.stdout.write(f"latency p50={statistics.median(timings):.1f}ms max={max(timings):.1f}ms")
+        if not options['keep']:
+            user.delete()
+
+        errors = sum(count for code, count in statuses.items() if code >= 500)
+        if errors:
+            failures.append(f"{errors} server errors")
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('Exactly one application per round, no server errors.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.job.application_counts import reconcile_application_counts
+
+
+class Command(BaseCommand):
+    help = "Recount applications per job and repair Job.application_count where it drifted. Safe to run periodically."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='Job ids recounted per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many jobs drifted.')
+
+    def handle(self, *args, **options):
+        fixed = reconcile_application_counts(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f"{fixed} jobs have a drifted application count.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired application count on {fixed} jobs."))
@@ -0,0 +1,43 @@
+import resource
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.job.search_indexing import reindex_all_jobs
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job search index into a new versioned index and atomically swap the job-index alias to it."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows per DB fetch and per bulk request.')
+        parser.add_argument('--threads', type=int, default=1, help='Concurrent bulk requests (uses parallel_bulk when > 1).')
+        parser.add_argument('--replicas', type=int, default=None, help='Replica count to set once loading finishes.')
+        parser.add_argument('--keep-old', action='store_true', help='Keep the indices the alias pointed at before.')
+        parser.add_argument('--allow-errors', action='store_true', help='Swap the alias even if some documents failed.')
+
+    def handle(self, *args, **options):
+        try:
+            result = reindex_all_jobs(
+                chunk_size=options['chunk_size'],
+                thread_count=options['threads'],
+                replicas=options['replicas'],
+                delete_old=not options['keep_old'],
+                allow_errors=options['allow_errors'],
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        docs = result['success']
+        rate = docs / result['seconds'] if result['seconds'] else 0.0
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {docs} jobs into {result['index']} ({result['errors']} errors) "
+            f"in {result['seconds']:.1f}s, {rate:.0f} docs/sec, peak RSS {peak_rss_mb:.0f} MB"
+        ))
+        if result['reconciled']:
+            self.stdout.write(f"Repaired {result['reconciled']} documents changed during the load")
+        if result['replaced']:
+            self.stdout.write(f"Alias moved off: {', '.join(result['replaced'])}")
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.job.index_outbox import process_batch, outbox_stats, requeue_parked
+
+
+class Command(BaseCommand):
+    help = "Drain the job search outbox into OpenSearch using the _bulk API. Safe to run several workers at once."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Outbox rows claimed per bulk request.')
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=float(getattr(settings, 'SEARCH_OUTBOX_POLL_INTERVAL', 1.0)),
+            help='Seconds to sleep when the outbox is empty.',
+        )
+        parser.add_argument('--once', action='store_true', help='Drain what is ready now and exit.')
+        parser.add_argument('--stats', action='store_true', help='Print queue depth and lag, then exit.')
+        parser.add_argument('--requeue-parked', action='store_true',
+                            help='Give rows parked after too many failures another round of attempts, then exit.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            stats = outbox_stats()
+            self.stdout.write(
+                f"depth={stats['depth']} retrying={stats['retrying']} parked={stats['parked']} "
+                f"lag_seconds={stats['lag_seconds']:.1f}"
+            )
+            return
+        if options['requeue_parked']:
+            self.stdout.write(f"Requeued {requeue_parked()} parked rows.")
+            return
+
+        self.stdout.write("Index worker started.")
+        try:
+            while True:
+                claimed = process_batch(options['batch_size'])
+                if claimed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write("Index worker stopped.")
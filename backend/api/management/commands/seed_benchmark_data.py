@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.job.models_job import Job
+from api.job.response_cache import invalidate_jobs
+from api.seed_data import BenchmarkDataset, flush_benchmark_data, load_benchmark_data, seeded_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic benchmark catalog (users, CVs, jobs, applications with Zipf-skewed popularity), "
+        "load it with COPY in one transaction, then build the search index for the configured backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--applications', type=int, default=500000, help='Approximate total applications.')
+        parser.add_argument('--tags', type=int, default=2000, help='Distinct tags (a short head, a long tail).')
+        parser.add_argument('--seed', type=int, default=42, help='Same seed and sizes, same dataset.')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete ALL jobs and applications, and previously seeded users, first.')
+        parser.add_argument('--index', choices=('auto', 'opensearch', 'memory', 'none'), default='auto',
+                            help='Search index to build after loading (auto follows SEARCH_BACKEND).')
+        parser.add_argument('--queries-file', help='Also write this many Zipf-distributed search terms here.')
+        parser.add_argument('--queries', type=int, default=1000, help='Lines to write to --queries-file.')
+
+    def handle(self, *args, **options):
+        dataset = BenchmarkDataset(
+            seed=options['seed'], jobs=options['jobs'], users=options['users'],
+            applications=options['applications'], tags=options['tags'],
+        )
+        started = time.monotonic()
+
+        def progress(table, rows):
+            self.stdout.write(f"  {table:<13} {rows:>10} rows  {time.monotonic() - started:7.1f}s")
+
+        with transaction.atomic():
+            if options['flush']:
+                with connection.cursor() as cursor:
+                    flush_benchmark_data(cursor)
+            elif Job.objects.exists() or seeded_users().exists():
+                # Job ids must start at 1 for the dataset to be reproducible
+                raise CommandError('Jobs or seeded users already exist; rerun with --flush to replace them.')
+            self.stdout.write(f"Loading seed {options['seed']}:")
+            load_benchmark_data(dataset, progress)
+            invalidate_jobs()
+
+        with connection.cursor() as cursor:
+            # Fresh planner statistics for the new row counts
+            cursor.execute("ANALYZE")
+        self.stdout.write(self.style.SUCCESS(f"Loaded in {time.monotonic() - started:.1f}s"))
+
+        index = options['index']
+        if index == 'auto':
+            index = {'opensearch': 'opensearch', 'memory': 'memory'}.get(settings.SEARCH_BACKEND, 'none')
+        if index == 'opensearch':
+            call_command('reindex_jobs', stdout=self.stdout)
+        elif index == 'memory':
+            call_command('build_search_snapshot', stdout=self.stdout)
+
+        if options['queries_file']:
+            with open(options['queries_file'], 'w') as f:
+                f.writelines(f'{query}\n' for query in dataset.queries(options['queries']))
+            self.stdout.write(f"Wrote {options['queries']} search terms to {options['queries_file']}")
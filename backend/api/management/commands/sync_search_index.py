@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from api.job.search_sync import sync_changes, reconcile
+
+
+class Command(BaseCommand):
+    help = "Push jobs changed since the last sync to the search index, then optionally repair drift block by block."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows per DB fetch and per bulk request.')
+        parser.add_argument('--reconcile', action='store_true', help='Compare block checksums and repair differences.')
+        parser.add_argument('--block-size', type=int, default=1000, help='Job ids per reconciliation block (max 4096).')
+
+    def handle(self, *args, **options):
+        result = sync_changes(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            f"Synced {result['success']} jobs to {result['index']} ({result['errors']} errors), "
+            f"watermark {result['watermark']}"
+        )
+        if options['reconcile']:
+            result = reconcile(block_size=options['block_size'])
+            self.stdout.write(
+                f"Checked {result['blocks']} blocks, {result['mismatched']} differed, "
+                f"repaired {result['repaired']} documents ({result['errors']} errors)"
+            )
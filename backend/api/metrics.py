@@ -0,0 +1,183 @@
+import bisect
+import hmac
+import logging
+import threading
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.http import Http404, HttpResponse
+
+from .timing import BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# Prometheus text exposition of in-process data, no client library or agent.
+# Every worker process keeps its own numbers, so scrape each worker (or run
+# one worker per scrape target) rather than a load balancer in front of them.
+
+METRICS_TOKEN = str(getattr(settings, 'METRICS_TOKEN', '') or '')
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        with self.lock:
+            series = {labels: list(values) for labels, values in self.series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {values[-1]!r}'
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+
+
+class Counter:
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def inc(self, labels, amount=1):
+        with self.lock:
+            self.series[labels] = self.series.get(labels, 0) + amount
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        with self.lock:
+            series = dict(self.series)
+        for labels, value in sorted(series.items()):
+            yield f'{self.name}{_labels(self.labelnames, labels)} {value}'
+
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by URL name.', ('view', 'method', 'status'), REQUEST_BUCKETS,
+)
+phase_duration = Histogram(
+    'http_request_phase_duration_seconds', 'Time per request spent in each phase (db, opensearch, s3, serialize).',
+    ('view', 'phase'), PHASE_BUCKETS,
+)
+phase_calls = Counter(
+    'http_request_phase_calls_total', 'Calls made in each phase (queries, OpenSearch requests, ...).', ('view', 'phase'),
+)
+
+
+# Called by ServerTimingMiddleware once per request
+def observe_request(view, method, status_code, total, timing):
+    request_duration.observe((view, method, f'{status_code // 100}xx'), total)
+    for bucket in BUCKETS:
+        calls = timing.counts[bucket]
+        if calls:
+            phase_duration.observe((view, bucket), timing.durations[bucket])
+            phase_calls.inc((view, bucket), calls)
+
+
+def _gauge(name, documentation, samples):
+    yield f'# HELP {name} {documentation}'
+    yield f'# TYPE {name} gauge'
+    for labels, value in samples:
+        yield f'{name}{labels} {_number(value)}'
+
+
+def _cache_gauges(prefix, stats, labels=''):
+    for key in ('size', 'hits', 'misses', 'evictions', 'expirations'):
+        yield from _gauge(f'{prefix}_{key}', f'{prefix.replace("_", " ").capitalize()} {key}.', [(labels, stats[key])])
+
+
+# Point-in-time state of the search pipeline and caches, read at scrape time
+def collect_gauges():
+    from .authentication import user_cache
+    from .job.models_job import JobIndexOutbox
+    from .job.opensearch_client import CircuitBreaker, search_breaker
+    from .job.response_cache import response_cache
+    from .s3 import presign_cache
+
+    yield from _gauge('job_index_outbox_depth', 'Search index changes waiting to be shipped.', [
+        ('', JobIndexOutbox.objects.count()),
+    ])
+    from .job.index_outbox import MAX_ATTEMPTS
+    failing = JobIndexOutbox.objects.aggregate(
+        retrying=Count('id', filter=Q(attempts__gt=0, attempts__lt=MAX_ATTEMPTS)),
+        parked=Count('id', filter=Q(attempts__gte=MAX_ATTEMPTS)),
+    )
+    yield from _gauge(
+        'job_index_outbox_retrying',
+        'Outbox entries that failed at least once: still retried, or parked after SEARCH_OUTBOX_MAX_ATTEMPTS.',
+        [(f'{{state="{state}"}}', failing[state]) for state in ('retrying', 'parked')],
+    )
+    state = search_breaker.state
+    yield from _gauge('opensearch_circuit_state', 'OpenSearch circuit breaker state (1 for the current state).', [
+        (f'{{state="{name}"}}', int(name == state))
+        for name in (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)
+    ])
+    yield from _cache_gauges('job_response_cache', response_cache.stats())
+    yield from _cache_gauges('s3_presign_cache', presign_cache.stats())
+    yield from _cache_gauges('auth_user_cache', user_cache.stats())
+
+
+def render_metrics():
+    lines = []
+    for metric in (request_duration, phase_duration, phase_calls):
+        lines.extend(metric.collect())
+    try:
+        lines.extend(collect_gauges())
+    except Exception as e:
+        # Request metrics are still worth serving when the database is down
+        logger.warning(f"Skipping gauges in /metrics: {e}")
+    return '\n'.join(lines) + '\n'
+
+
+# GET /metrics. With METRICS_TOKEN set, scrapers send `Authorization: Bearer <token>`;
+# without it the endpoint only exists in DEBUG.
+
+def metrics_view(request):
+    if METRICS_TOKEN:
+        expected = f'Bearer {METRICS_TOKEN}'.encode()
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+            return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
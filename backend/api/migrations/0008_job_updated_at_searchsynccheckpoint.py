@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_jobindexoutbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchSyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index_name", models.CharField(max_length=255, unique=True)),
+                ("watermark", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        # Existing rows were last changed no later than they were created as far as we know
+        migrations.RunSQL(
+            "UPDATE api_job SET updated_at = created_at",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:49
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keeps api_job.search_vector in sync on every insert/update, including
+# queryset.update() and raw SQL writes that bypass the ORM.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION api_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(
+            (SELECT string_agg(tag, ' ') FROM jsonb_array_elements_text(NEW.tags) AS tag), ''
+        )), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, company, description, tags ON api_job
+    FOR EACH ROW EXECUTE FUNCTION api_job_search_vector_update();
+
+UPDATE api_job SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS api_job_search_vector_trigger ON api_job;
+DROP FUNCTION IF EXISTS api_job_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_job_updated_at_searchsynccheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="job_search_vector_gin"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:57
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so a large job table stays writable during the migration
+    atomic = False
+
+    dependencies = [
+        ("api", "0010_cachegeneration"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="job",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="job_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_job_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobapplication",
+            name="idempotency_key",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+# Keeps api_job.application_count in step with api_jobapplication in the same
+# statement as the write, including raw SQL inserts (ApplyJobView) and cascade
+# deletes. updated_at moves too, so the search sync and cached responses see
+# the new count.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION api_jobapplication_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE api_job SET application_count = application_count + 1, updated_at = NOW()
+        WHERE id = NEW.job_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE api_job SET application_count = GREATEST(application_count - 1, 0), updated_at = NOW()
+        WHERE id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_jobapplication_count_trigger
+    AFTER INSERT OR DELETE ON api_jobapplication
+    FOR EACH ROW EXECUTE FUNCTION api_jobapplication_count_update();
+
+CREATE TRIGGER api_jobapplication_count_move_trigger
+    AFTER UPDATE OF job_id ON api_jobapplication
+    FOR EACH ROW WHEN (OLD.job_id IS DISTINCT FROM NEW.job_id)
+    EXECUTE FUNCTION api_jobapplication_count_update();
+
+UPDATE api_job SET application_count = counts.n
+FROM (SELECT job_id, COUNT(*) AS n FROM api_jobapplication GROUP BY job_id) AS counts
+WHERE api_job.id = counts.job_id;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS api_jobapplication_count_move_trigger ON api_jobapplication;
+DROP TRIGGER IF EXISTS api_jobapplication_count_trigger ON api_jobapplication;
+DROP FUNCTION IF EXISTS api_jobapplication_count_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_jobapplication_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="application_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_jobchange"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="jobchange",
+            name="op",
+            field=models.CharField(
+                choices=[("delete", "Delete"), ("count", "Application count")],
+                max_length=10,
+            ),
+        ),
+    ]
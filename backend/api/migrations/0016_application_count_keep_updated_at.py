@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# The count trigger (0013) also moved api_job.updated_at. Every apply then changed
+# the job list's ETag and Last-Modified for every client. Counts now reach the
+# search indexes through SearchBackend.application_counts_changed(), so the
+# trigger maintains the counter only.
+COUNT_ONLY = """
+CREATE OR REPLACE FUNCTION api_jobapplication_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE api_job SET application_count = application_count + 1 WHERE id = NEW.job_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE api_job SET application_count = GREATEST(application_count - 1, 0) WHERE id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+COUNT_AND_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION api_jobapplication_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE api_job SET application_count = application_count + 1, updated_at = NOW()
+        WHERE id = NEW.job_id;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE api_job SET application_count = GREATEST(application_count - 1, 0), updated_at = NOW()
+        WHERE id = OLD.job_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_jobchange_count"),
+    ]
+
+    operations = [
+        migrations.RunSQL(COUNT_ONLY, reverse_sql=COUNT_AND_UPDATED_AT),
+    ]
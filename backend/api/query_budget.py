@@ -0,0 +1,99 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Query budgets: a view declares how many SQL queries one request may run, as
+# an int or a per-method dict, e.g. `query_budget = {'GET': 3}`. The middleware
+# checks every request against it in development, and assert_max_queries()
+# does the same around any block of code in tests or the shell.
+
+QUERY_BUDGET_STRICT = bool(getattr(settings, 'QUERY_BUDGET_STRICT', True))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+
+    def __init__(self):
+        self.queries = []
+
+    # django.db execute wrapper; sees the SQL template, so repeated templates point at N+1 loops
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def duplicates(self):
+        return {sql: count for sql, count in Counter(self.queries).most_common() if count > 1}
+
+    def report(self, limit=5):
+        lines = [f"{len(self.queries)} queries"]
+        for sql, count in list(self.duplicates().items())[:limit]:
+            lines.append(f"  {count}x {sql[:200]}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def capture_queries(using=None):
+    from django.db import connections
+    log = QueryLog()
+    with (connections[using] if using else connection).execute_wrapper(log):
+        yield log
+
+
+# Test helper: fail if the block runs more than max_queries queries
+#
+#     with assert_max_queries(3):
+#         client.get('/api/jobs/1/applicants/')
+
+@contextmanager
+def assert_max_queries(max_queries, using=None):
+    with capture_queries(using) as log:
+        yield log
+    if len(log) > max_queries:
+        raise QueryBudgetExceeded(f"Query budget of {max_queries} exceeded: {log.report()}")
+
+
+def view_budget(view_func, method):
+    budget = getattr(getattr(view_func, 'view_class', None), 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+# Development middleware (enabled with QUERY_BUDGET=True). Adds X-Query-Count
+# to every response, logs repeated statements, and raises QueryBudgetExceeded
+# when a view runs more queries than its declared budget.
+
+class QueryBudgetMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.query_budget = None
+        with capture_queries() as log:
+            response = self.get_response(request)
+        response['X-Query-Count'] = str(len(log))
+        budget = request.query_budget
+        duplicates = log.duplicates()
+        if duplicates:
+            logger.warning(f"{request.method} {request.path}: repeated SQL\n{log.report()}")
+        if budget is not None and len(log) > budget:
+            message = f"{request.method} {request.path} ran {len(log)} queries, budget is {budget}\n{log.report()}"
+            if QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = view_budget(view_func, request.method)
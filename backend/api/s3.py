@@ -0,0 +1,143 @@
+import logging
+import threading
+
+from django.conf import settings
+from rest_framework import serializers
+
+from api.lru_cache import LRUCache
+from api.timing import timed
+
+logger = logging.getLogger(__name__)
+
+AWS_REGION = getattr(settings, 'AWS_REGION', 'us-east-1')
+AWS_STORAGE_BUCKET_NAME = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', None)
+# Point at a local S3 stand-in (e.g. `moto_server` on http://localhost:5000) for development and tests
+AWS_S3_ENDPOINT_URL = getattr(settings, 'AWS_S3_ENDPOINT_URL', None)
+PRESIGN_EXPIRES = int(getattr(settings, 'AWS_S3_PRESIGN_EXPIRES', 600))
+# Cached URLs are handed out until this many seconds before they expire
+PRESIGN_REFRESH_MARGIN = int(getattr(settings, 'AWS_S3_PRESIGN_REFRESH_MARGIN', 60))
+
+presign_cache = LRUCache(
+    maxsize=int(getattr(settings, 'AWS_S3_PRESIGN_CACHE_SIZE', 10000)),
+    ttl=max(PRESIGN_EXPIRES - PRESIGN_REFRESH_MARGIN, 0),
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# One client per process; boto3 clients are thread-safe once created
+
+def get_s3_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import boto3
+                from botocore.config import Config
+                if AWS_S3_ENDPOINT_URL:
+                    # Local stand-ins do not resolve bucket subdomains
+                    endpoint_url, config = AWS_S3_ENDPOINT_URL, Config(s3={'addressing_style': 'path'})
+                else:
+                    endpoint_url, config = f'https://s3.{AWS_REGION}.amazonaws.com', None
+                _client = boto3.client(
+                    's3',
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=AWS_REGION,
+                    endpoint_url=endpoint_url,
+                    config=config,
+                )
+    return _client
+
+
+# Stored file URLs always use the public virtual-hosted form, whatever endpoint served the upload
+
+def object_url(key):
+    return f"https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{key}"
+
+
+def key_from_url(file_url):
+    if not file_url:
+        return None
+    prefix = object_url('')
+    if file_url.startswith(prefix):
+        # The raw key as it appears in the URL (do NOT decode)
+        return file_url[len(prefix):]
+    if '.amazonaws.com/' in file_url:
+        return file_url.split('.amazonaws.com/', 1)[-1]
+    return None
+
+
+@timed('s3')
+def upload_fileobj(fileobj, key, content_type):
+    get_s3_client().upload_fileobj(
+        fileobj, AWS_STORAGE_BUCKET_NAME, key, ExtraArgs={'ACL': 'private', 'ContentType': content_type},
+    )
+    return object_url(key)
+
+
+# Presign GET URLs for many keys in one pass. Signing is local (no request to
+# S3); recently signed URLs come from presign_cache. Returns {key: url}.
+
+@timed('s3')
+def presign_urls(keys):
+    urls = {}
+    missing = []
+    for key in dict.fromkeys(key for key in keys if key):
+        url = presign_cache.get((AWS_STORAGE_BUCKET_NAME, key))
+        if url is None:
+            missing.append(key)
+        else:
+            urls[key] = url
+    if not missing:
+        return urls
+    try:
+        client = get_s3_client()
+        for key in missing:
+            url = client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': AWS_STORAGE_BUCKET_NAME, 'Key': key},
+                ExpiresIn=PRESIGN_EXPIRES,
+            )
+            presign_cache.set((AWS_STORAGE_BUCKET_NAME, key), url)
+            urls[key] = url
+    except Exception as e:
+        logger.error(f"Failed to presign S3 URLs: {e}")
+    return urls
+
+
+def presigned_url(file_url):
+    key = key_from_url(file_url)
+    return presign_urls([key]).get(key) if key else None
+
+
+# list_serializer_class for serializers with a presigned URL field. The child
+# serializer implements get_file_url(obj); URLs for the whole page are signed
+# up front and looked up with child.presigned_url_for(obj).
+
+class PresignedURLListSerializer(serializers.ListSerializer):
+
+    @timed('serialize')
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        keys = [key_from_url(self.child.get_file_url(item)) for item in items]
+        self.child.presigned_urls = presign_urls(keys)
+        try:
+            return super().to_representation(items)
+        finally:
+            self.child.presigned_urls = None
+
+
+class PresignedURLMixin:
+    presigned_urls = None
+
+    def get_file_url(self, obj):
+        raise NotImplementedError
+
+    def presigned_url_for(self, obj):
+        file_url = self.get_file_url(obj)
+        if self.presigned_urls is None:
+            return presigned_url(file_url)
+        key = key_from_url(file_url)
+        return self.presigned_urls.get(key) if key else None
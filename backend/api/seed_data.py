@@ -0,0 +1,307 @@
+import csv
+import io
+import json
+import random
+from array import array
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection
+
+from api.job.application_counts import COUNT_TRIGGERS
+from api.job.models_job import Job, JobApplication, JobIndexOutbox
+from api.s3 import object_url
+from api.user.models_user import User, UserCV
+
+# Deterministic synthetic catalog for benchmarks: the same seed and sizes give
+# the same rows. Popularity is Zipf-distributed everywhere it is in real data:
+# a few jobs draw most applications, a few tags, locations and companies cover
+# most jobs, and description words (and so search terms) follow Zipf's law.
+
+# Timestamps are relative to a fixed instant so they are part of the seeded data
+ANCHOR = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+CATALOG_SPAN = timedelta(days=365)
+SEED_EMAIL_PREFIX = 'bench-user-'
+SEED_EMAIL_DOMAIN = '@example.com'
+SEED_PASSWORD = 'benchmark'
+ZIPF_EXPONENT = 1.1
+COPY_BATCH_ROWS = 20000
+
+LOCATIONS = [
+    'Remote', 'London', 'New York', 'San Francisco', 'Berlin', 'Bangalore', 'Toronto', 'Dhaka', 'Singapore',
+    'Amsterdam', 'Paris', 'Austin', 'Seattle', 'Sydney', 'Dublin', 'Stockholm', 'Madrid', 'Lisbon', 'Warsaw',
+    'Chicago', 'Boston', 'Tokyo', 'Dubai', 'Zurich', 'Munich', 'Hyderabad', 'Pune', 'Kuala Lumpur', 'Cape Town',
+    'Lagos', 'Nairobi', 'Sao Paulo', 'Mexico City', 'Buenos Aires', 'Vancouver', 'Montreal', 'Copenhagen', 'Oslo',
+    'Helsinki', 'Prague', 'Vienna', 'Tallinn', 'Bucharest', 'Athens', 'Istanbul', 'Tel Aviv', 'Karachi', 'Manila',
+]
+ROLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Data Engineer',
+    'Data Scientist', 'DevOps Engineer', 'Site Reliability Engineer', 'Mobile Developer', 'QA Engineer',
+    'Product Manager', 'Product Designer', 'Machine Learning Engineer', 'Security Engineer', 'Solutions Architect',
+    'Engineering Manager', 'Technical Writer', 'Database Administrator', 'Cloud Engineer', 'Platform Engineer',
+    'Android Developer', 'iOS Developer', 'Embedded Engineer', 'Support Engineer', 'Business Analyst',
+    'Data Analyst', 'Scrum Master', 'UX Researcher', 'Network Engineer', 'Systems Administrator',
+]
+LEVELS = ['', '', '', 'Junior ', 'Senior ', 'Senior ', 'Staff ', 'Lead ', 'Principal ']
+TECH_TAGS = [
+    'python', 'javascript', 'typescript', 'react', 'django', 'aws', 'sql', 'postgresql', 'docker', 'kubernetes',
+    'java', 'go', 'node', 'graphql', 'rest', 'linux', 'terraform', 'gcp', 'azure', 'redis', 'kafka', 'spark',
+    'airflow', 'pandas', 'pytorch', 'tensorflow', 'swift', 'kotlin', 'react-native', 'flutter', 'vue', 'angular',
+    'rust', 'c++', 'c#', '.net', 'ruby', 'rails', 'php', 'laravel', 'elasticsearch', 'opensearch', 'mongodb',
+    'mysql', 'ci/cd', 'git', 'agile', 'microservices', 'security', 'figma', 'scala', 'hadoop', 'snowflake', 'dbt',
+    'looker', 'tableau', 'excel', 'jira', 'selenium', 'cypress', 'playwright', 'ansible', 'prometheus', 'grafana',
+]
+COMMON_WORDS = [
+    'team', 'build', 'experience', 'product', 'work', 'customers', 'data', 'systems', 'design', 'scale',
+    'platform', 'services', 'engineering', 'develop', 'users', 'quality', 'features', 'growth', 'support',
+    'performance', 'reliable', 'collaborate', 'code', 'review', 'ownership', 'remote', 'hybrid', 'office',
+    'benefits', 'salary', 'equity', 'learning', 'mentoring', 'startup', 'enterprise', 'cloud', 'api', 'mobile',
+    'web', 'infrastructure', 'pipeline', 'analytics', 'testing', 'automation', 'deploy', 'monitoring', 'security',
+    'mission', 'impact', 'fast', 'paced', 'communication', 'english', 'degree', 'years', 'strong', 'knowledge',
+]
+SYLLABLES = ['ka', 'lo', 'mi', 'zen', 'tra', 'vo', 'nex', 'ri', 'sa', 'tu', 'bel', 'cor', 'dia', 'fen', 'gro',
+             'hal', 'in', 'jun', 'kel', 'lum', 'mar', 'nor', 'ox', 'pra', 'qui', 'ro', 'sil', 'tek', 'ul', 'ven']
+COMPANY_SUFFIXES = ['Labs', 'Systems', 'Tech', 'Software', 'Analytics', 'Health', 'Pay', 'Works', 'AI', 'Cloud']
+FIRST_NAMES = ['Alex', 'Sam', 'Priya', 'Wei', 'Fatima', 'John', 'Maria', 'Yuki', 'Omar', 'Elena', 'Kwame', 'Lucia',
+               'Arjun', 'Chen', 'Sara', 'Ivan', 'Aisha', 'Noah', 'Mina', 'Diego', 'Nadia', 'Tom', 'Leila', 'Ravi']
+LAST_NAMES = ['Khan', 'Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Nguyen', 'Rahman', 'Silva', 'Muller', 'Rossi',
+              'Ivanova', 'Okafor', 'Tanaka', 'Haddad', 'Novak', 'Cohen', 'Lopez', 'Ahmed', 'Berg', 'Das', 'Costa']
+
+
+class Zipf:
+    # Draws from `items` with probability proportional to 1 / rank ** exponent (first item is rank 1)
+
+    def __init__(self, items, exponent=ZIPF_EXPONENT):
+        self.items = items
+        self.cum_weights = list(accumulate(1 / rank ** exponent for rank in range(1, len(items) + 1)))
+
+    def draw(self, rng, k=1):
+        return rng.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+
+def _word(rng, syllables):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(syllables))
+
+
+def _long_tail(rng, count, syllables, exclude=()):
+    words = list(dict.fromkeys(_word(rng, rng.randint(*syllables)) for _ in range(count * 2)))
+    return [word for word in words if word not in exclude][:count]
+
+
+# Row generators for users, CVs, applications and jobs. Every table draws from
+# its own RNG, seeded from `seed` and the table name, so adding a table or
+# changing one generator leaves the others' rows as they were. Generate in
+# load order: CVs before applications, applications before jobs.
+
+class BenchmarkDataset:
+
+    def __init__(self, seed=42, jobs=100000, users=20000, applications=500000, tags=2000, companies=5000):
+        self.seed = seed
+        self.job_count = jobs
+        self.user_count = users
+        self.application_count = applications
+        vocabulary = self.rng('vocabulary')
+        self.tags = Zipf(TECH_TAGS + _long_tail(vocabulary, max(tags - len(TECH_TAGS), 0), (2, 3), TECH_TAGS))
+        self.companies = Zipf([
+            f"{_word(vocabulary, vocabulary.randint(2, 3)).capitalize()} {vocabulary.choice(COMPANY_SUFFIXES)}"
+            for _ in range(companies)
+        ])
+        self.locations = Zipf(LOCATIONS)
+        self.roles = Zipf(ROLES)
+        self.words = Zipf(COMMON_WORDS + TECH_TAGS + _long_tail(vocabulary, 5000, (2, 4), COMMON_WORDS))
+        # Popularity rank -> job id, so the most applied-to jobs are spread over the catalog
+        ranks = list(range(1, jobs + 1))
+        self.rng('popularity').shuffle(ranks)
+        self.popular_jobs = Zipf(ranks)
+        self.job_application_counts = array('I', bytes(4 * (jobs + 1)))
+
+    def rng(self, part):
+        # String seeds hash the same way on every run (unlike hash())
+        return random.Random(f'{self.seed}:{part}')
+
+    # Jobs are spread evenly over CATALOG_SPAN in id order, with up to an hour of jitter
+    def job_created_at(self, job_id):
+        offset = CATALOG_SPAN * (job_id - 1) / max(self.job_count, 1)
+        return ANCHOR - CATALOG_SPAN + offset + timedelta(seconds=job_id * 2654435761 % 3600)
+
+    def email(self, number):
+        return f'{SEED_EMAIL_PREFIX}{number:07d}{SEED_EMAIL_DOMAIN}'
+
+    def description(self, rng, title, tags):
+        sentences = [f"Join our team as {title}."]
+        for _ in range(rng.randint(3, 8)):
+            words = self.words.draw(rng, rng.randint(8, 16))
+            sentences.append(' '.join(words).capitalize() + '.')
+        sentences.append(f"You have experience with {', '.join(tags)}.")
+        return ' '.join(sentences)
+
+    def user_rows(self, first_id):
+        rng = self.rng('users')
+        password = make_password(SEED_PASSWORD, salt=f'seed{self.seed}')
+        for number in range(self.user_count):
+            joined = ANCHOR - CATALOG_SPAN * 2 * rng.random()
+            yield (
+                first_id + number, password, None, False, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+                False, True, joined, self.email(number), f'+1555{rng.randrange(10 ** 7):07d}', 'USER',
+            )
+
+    # Most users have one CV, some two or three, some none. Fills self.user_cvs
+    # (user number -> CV ids) for the application generator.
+    def cv_rows(self, first_user_id, first_id):
+        rng = self.rng('cvs')
+        self.user_cvs = []
+        cv_id = first_id
+        for number in range(self.user_count):
+            cvs = []
+            for index in range(rng.choices((0, 1, 2, 3), weights=(25, 55, 15, 5))[0]):
+                file_name = f'cv-{number}-{index + 1}.pdf'
+                key = f'cvs/seed/{first_user_id + number}/{file_name}'
+                yield (cv_id, first_user_id + number, object_url(key), file_name, ANCHOR - CATALOG_SPAN * rng.random())
+                cvs.append(cv_id)
+                cv_id += 1
+            self.user_cvs.append(cvs)
+
+    # Per-user application counts are exponential (a few very active users);
+    # each application picks a job by Zipf popularity. Fills job_application_counts.
+    def application_rows(self, first_user_id, first_id):
+        rng = self.rng('applications')
+        mean = self.application_count / max(self.user_count, 1)
+        application_id = first_id
+        for number in range(self.user_count):
+            wanted = min(round(rng.expovariate(1 / mean)) if mean else 0, self.job_count)
+            job_ids = set()
+            for _ in range(3):
+                job_ids.update(self.popular_jobs.draw(rng, wanted - len(job_ids)))
+                if len(job_ids) >= wanted:
+                    break
+            cvs = self.user_cvs[number]
+            for job_id in sorted(job_ids):
+                created_at = self.job_created_at(job_id)
+                applied_at = created_at + (ANCHOR - created_at) * rng.random()
+                note = rng.choice(('', '', '', 'Available immediately.', 'Open to relocation.'))
+                yield (
+                    application_id, first_user_id + number, job_id, rng.choice(cvs) if cvs else None, note,
+                    applied_at, '',
+                )
+                self.job_application_counts[job_id] += 1
+                application_id += 1
+
+    # application_rows() must run first: the counts are written with the jobs
+    def job_rows(self):
+        rng = self.rng('jobs')
+        for job_id in range(1, self.job_count + 1):
+            title = f"{rng.choice(LEVELS)}{self.roles.draw(rng)[0]}"
+            tags = list(dict.fromkeys(self.tags.draw(rng, rng.randint(2, 6))))
+            created_at = self.job_created_at(job_id)
+            yield (
+                job_id, title, self.companies.draw(rng)[0], self.description(rng, title, tags),
+                self.locations.draw(rng)[0], json.dumps(tags),
+                'Contract' if rng.random() < 0.15 else 'Full-time', created_at, created_at,
+                self.job_application_counts[job_id],
+            )
+
+    # Search terms with the catalog's skew: roles, tags and description words by Zipf rank
+    def queries(self, count):
+        rng = self.rng('queries')
+        sources = (self.roles, self.tags, self.words)
+        queries = []
+        for _ in range(count):
+            source = rng.choices(sources, weights=(3, 4, 3))[0]
+            terms = source.draw(rng, 1 if source is self.roles else rng.choice((1, 1, 2)))
+            queries.append(' '.join(terms))
+        return queries
+
+
+USER_COLUMNS = (
+    'id', 'password', 'last_login', 'is_superuser', 'first_name', 'last_name', 'is_staff', 'is_active',
+    'date_joined', 'email', 'contact_number', 'user_type',
+)
+CV_COLUMNS = ('id', 'user_id', 'file_url', 'file_name', 'uploaded_at')
+APPLICATION_COLUMNS = ('id', 'user_id', 'job_id', 'cv_id', 'note', 'applied_at', 'idempotency_key')
+# search_vector is filled in by its trigger
+JOB_COLUMNS = (
+    'id', 'title', 'company', 'description', 'location', 'tags', 'employment_type', 'created_at', 'updated_at',
+    'application_count',
+)
+
+
+# Stream rows into a table with COPY ... FROM STDIN in CSV format, one batch
+# of rows in memory at a time. No model signals run. Returns the row count.
+
+def copy_rows(cursor, model, columns, rows, batch_rows=COPY_BATCH_ROWS):
+    quote = connection.ops.quote_name
+    # Strings are always quoted so '' stays an empty string; csv writes None as "" too,
+    # which FORCE_NULL turns into NULL for the nullable columns
+    fields = {field.column: field for field in model._meta.concrete_fields}
+    nullable = [quote(column) for column in columns if fields[column].null]
+    options = f"FORMAT csv, FORCE_NULL ({', '.join(nullable)})" if nullable else "FORMAT csv"
+    sql = (
+        f"COPY {quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)}) "
+        f"FROM STDIN WITH ({options})"
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % batch_rows == 0:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    return count
+
+
+def _next_id(cursor, model):
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {connection.ops.quote_name(model._meta.db_table)}")
+    return cursor.fetchone()[0]
+
+
+def seeded_users():
+    return User.objects.filter(email__startswith=SEED_EMAIL_PREFIX, email__endswith=SEED_EMAIL_DOMAIN)
+
+
+# Remove all jobs, applications and outbox entries, and the seeded users with their CVs
+def flush_benchmark_data(cursor):
+    quote = connection.ops.quote_name
+    tables = ', '.join(quote(model._meta.db_table) for model in (JobApplication, Job, JobIndexOutbox))
+    cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY")
+    users_sql, params = seeded_users().values('id').query.sql_with_params()
+    cursor.execute(f"DELETE FROM {quote(UserCV._meta.db_table)} WHERE user_id IN ({users_sql})", params)
+    cursor.execute(f"DELETE FROM {quote(User._meta.db_table)} WHERE id IN ({users_sql})", params)
+
+
+# Load the dataset in one transaction (the caller's). Applications are copied
+# before the jobs they reference, which works because Django creates foreign
+# keys DEFERRABLE INITIALLY DEFERRED; that way every job row is written once,
+# with its final application_count, and the per-row count triggers stay
+# disabled for the load. Postgres refuses ALTER TABLE on a table with pending
+# trigger events, so the deferred FK checks are run (SET CONSTRAINTS ALL
+# IMMEDIATE) once the jobs exist and before the triggers are re-enabled.
+# `progress(table, rows)` is called after each table.
+
+def load_benchmark_data(dataset, progress=lambda table, rows: None):
+    applications_table = connection.ops.quote_name(JobApplication._meta.db_table)
+    with connection.cursor() as cursor:
+        first_user_id = _next_id(cursor, User)
+        progress('users', copy_rows(cursor, User, USER_COLUMNS, dataset.user_rows(first_user_id)))
+        cv_rows = dataset.cv_rows(first_user_id, _next_id(cursor, UserCV))
+        progress('cvs', copy_rows(cursor, UserCV, CV_COLUMNS, cv_rows))
+        for trigger in COUNT_TRIGGERS:
+            cursor.execute(f"ALTER TABLE {applications_table} DISABLE TRIGGER {trigger}")
+        progress('applications', copy_rows(
+            cursor, JobApplication, APPLICATION_COLUMNS,
+            dataset.application_rows(first_user_id, _next_id(cursor, JobApplication)),
+        ))
+        progress('jobs', copy_rows(cursor, Job, JOB_COLUMNS, dataset.job_rows()))
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        for trigger in COUNT_TRIGGERS:
+            cursor.execute(f"ALTER TABLE {applications_table} ENABLE TRIGGER {trigger}")
+        for sql in connection.ops.sequence_reset_sql(no_style(), [User, UserCV, Job, JobApplication]):
+            cursor.execute(sql)
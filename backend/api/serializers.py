@@ -1,32 +1,4 @@
-
 # Split serializers for user and job
-from .user.serializers_user import *
-from .job.serializers_job import *
-from rest_framework import serializers
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['id', 'email', 'role']  # Add other fields as necessary
-
-class RegisterSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['email', 'password', 'role']
-        extra_kwargs = {'password': {'write_only': True}}
-
-    def create(self, validated_data):
-        user = User(
-            email=validated_data['email'],
-            role=validated_data['role']
-        )
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
-
-class LoginSerializer(serializers.Serializer):
-    email = serializers.EmailField()
-    password = serializers.CharField(write_only=True)
\ No newline at end of file
+from .user.serializers_user import RegisterSerializer, LoginSerializer, UserDetailSerializer, UserUpdateSerializer
+from .user.serializers_cv import UserCVSerializer
+from .job.serializers_job import JobSerializer, JobApplicationSerializer
@@ -0,0 +1,128 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# Per-request latency breakdown. Code that talks to a backing service or
+# serializes a payload runs inside `with timed('<bucket>'):`; the middleware
+# reports the buckets in a Server-Timing header and feeds the /metrics
+# histograms. Buckets are exclusive: time spent in a nested bucket (a lazy
+# query while serializing, presigning inside a list serializer) is taken out of
+# the enclosing one, so the buckets never add up to more than the request.
+
+BUCKETS = ('db', 'opensearch', 's3', 'serialize')
+SERVER_TIMING_HEADER = bool(getattr(settings, 'SERVER_TIMING_HEADER', settings.DEBUG))
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    __slots__ = ('started', 'durations', 'counts', 'stack')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = dict.fromkeys(BUCKETS, 0.0)
+        self.counts = dict.fromkeys(BUCKETS, 0)
+        self.stack = []  # [bucket, start of its current uninterrupted segment]
+
+    def enter(self, bucket):
+        now = time.perf_counter()
+        if self.stack:
+            parent = self.stack[-1]
+            self.durations[parent[0]] += now - parent[1]
+        self.counts[bucket] += 1
+        self.stack.append([bucket, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        bucket, started = self.stack.pop()
+        self.durations[bucket] += now - started
+        if self.stack:
+            self.stack[-1][1] = now
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        entries = [
+            f'{bucket};desc="{self.counts[bucket]} call{"s" if self.counts[bucket] != 1 else ""}";'
+            f'dur={self.durations[bucket] * 1000:.2f}'
+            for bucket in BUCKETS if self.counts[bucket]
+        ]
+        app = total - sum(self.durations.values())
+        entries.append(f'app;dur={max(app, 0) * 1000:.2f}')
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+# Outside a request (commands, workers, streamed response bodies) this is a no-op.
+# Also usable as a decorator on sync functions.
+@contextmanager
+def timed(bucket):
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    timing.enter(bucket)
+    try:
+        yield
+    finally:
+        timing.exit()
+
+
+# django.db execute wrapper installed on every connection (see install_db_timer)
+def _db_timer(execute, sql, params, many, context):
+    with timed('db'):
+        return execute(sql, params, many, context)
+
+
+def install_db_timer(sender, connection, **kwargs):
+    if _db_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_timer)
+
+
+# Outermost middleware: times the whole request, adds Server-Timing and records
+# the request in the /metrics histograms. Works under WSGI and ASGI; the
+# contextvar follows the request into sync_to_async threads.
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        from .metrics import observe_request
+        total = timing.elapsed()
+        if SERVER_TIMING_HEADER:
+            response['Server-Timing'] = timing.server_timing(total)
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        observe_request(view, request.method, response.status_code, total, timing)
+        return response
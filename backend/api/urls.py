@@ -1,11 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
-    UserLoginView, UserRegisterView, CurrentUserView, UpdateCurrentUserView, DeleteCurrentUserView,
+    UserLoginView, UserRegisterView, CurrentUserView, UpdateCurrentUserView, DeleteCurrentUserView, ChangePasswordView,
     JobListCreateView, JobRetrieveUpdateDestroyView, ApplyJobView, JobApplicantsListView, UserCVListView, UserCVUploadView,
-JobSearchView
+    JobSearchView, AsyncJobSearchView, JobAutocompleteView, JobCacheStatsView, JobApplicantsExportView
 )
-from api.user.views_user import ChangePasswordView
-from api.user.views_cv import UserCVUploadView
 from django.contrib import admin
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -26,6 +25,9 @@ urlpatterns = [
     path('jobs/<int:pk>/', JobRetrieveUpdateDestroyView.as_view(), name='job-detail'),
     path('jobs/<int:job_id>/apply/', ApplyJobView.as_view(), name='job-apply'),
     path('jobs/<int:job_id>/applicants/', JobApplicantsListView.as_view(), name='job-applicants'),
-    path('jobs/search/', JobSearchView.as_view(), name='job-search'),
+    path('jobs/<int:job_id>/applicants/export/', JobApplicantsExportView.as_view(), name='job-applicants-export'),
+    path('jobs/search/', (AsyncJobSearchView if settings.SEARCH_ASYNC else JobSearchView).as_view(), name='job-search'),
+    path('jobs/autocomplete/', JobAutocompleteView.as_view(), name='job-autocomplete'),
+    path('jobs/cache/stats/', JobCacheStatsView.as_view(), name='job-cache-stats'),
 
 ]
\ No newline at end of file
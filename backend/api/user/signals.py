@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from api.authentication import invalidate_user
+from .models_user import User
+
+# Cached authentication (api.authentication) must not outlive a change to a user:
+# every update or deletion invalidates the user's cached copy in all processes.
+
+@receiver(post_save, sender=User)
+def invalidate_user_on_save(sender, instance, created, **kwargs):
+    # Nothing can be cached yet for a new user
+    if created:
+        return
+    invalidate_user(instance.pk)
+
+@receiver(post_delete, sender=User)
+def invalidate_user_on_delete(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
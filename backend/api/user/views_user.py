@@ -3,10 +3,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status as drf_status
 from rest_framework import generics, serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.response import Response
+from api.authentication import UserRefreshToken
 from .models_user import User
 
 class LoginSerializer(serializers.Serializer):
@@ -38,7 +38,7 @@ class UserLoginView(generics.GenericAPIView):
         password = serializer.validated_data['password']
         user = User.objects.filter(email=email).first()
         if user and user.check_password(password) and user.is_active:
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -1,6 +1,10 @@
-
-# Split views for user and job
-from .user.views_user import *
-from .user.views_cv import *
-from .job.views_job import *
-from .job.search_views import *
\ No newline at end of file
+# Split views for user and job; imported by name so the URLconf only loads what it routes
+from .user.views_user import (
+    UserLoginView, UserRegisterView, CurrentUserView, UpdateCurrentUserView, DeleteCurrentUserView, ChangePasswordView,
+)
+from .user.views_cv import UserCVListView, UserCVUploadView
+from .job.views_job import (
+    JobListCreateView, JobRetrieveUpdateDestroyView, ApplyJobView, JobApplicantsListView, JobApplicantsExportView,
+    JobCacheStatsView,
+)
+from .job.search_views import JobSearchView, AsyncJobSearchView, JobAutocompleteView
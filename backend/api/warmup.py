@@ -0,0 +1,36 @@
+import importlib
+import logging
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Request code imports these on first use, so commands and a non-preloaded
+# worker never pay for them; a preloading master imports them once for all workers
+LAZY_IMPORTS = ('boto3', 'botocore.config', 'opensearchpy')
+
+
+# Run by the gunicorn master when it preloads the app (see gunicorn.conf.py), before
+# workers fork: whatever is loaded here is shared with every worker copy-on-write.
+# Nothing that cannot cross a fork may be left behind: database connections are
+# closed, and no client with a connection pool or background thread is created.
+
+def warm_up():
+    # Loads the URLconf, which imports every view
+    get_resolver().url_patterns
+    for name in LAZY_IMPORTS:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"Not preloading {name}: {e}")
+    backends = (getattr(settings, 'SEARCH_BACKEND', 'opensearch'), getattr(settings, 'SEARCH_FALLBACK_BACKEND', ''))
+    if 'memory' in backends:
+        from api.job.search_memory import get_memory_index
+        try:
+            get_memory_index()
+        except Exception as e:
+            # Workers build the index on their first search instead
+            logger.warning(f"Not preloading the search index: {e}")
+    connections.close_all()
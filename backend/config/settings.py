@@ -17,10 +17,39 @@ AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
 AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME")
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+# Custom S3 endpoint, e.g. a local moto server; unset for AWS
+AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL") or None
+AWS_S3_PRESIGN_EXPIRES = int(os.environ.get("AWS_S3_PRESIGN_EXPIRES", 600))
 OPENSEARCH_HOST = os.environ.get("OPENSEARCH_HOST", "localhost")
 OPENSEARCH_PORT = int(os.environ.get("OPENSEARCH_PORT", 9200))
 OPENSEARCH_USER = os.environ.get("OPENSEARCH_USER", None)
 OPENSEARCH_PASS = os.environ.get("OPENSEARCH_PASS", None)
+OPENSEARCH_POOL_SIZE = int(os.environ.get("OPENSEARCH_POOL_SIZE", 10))
+OPENSEARCH_TIMEOUT = float(os.environ.get("OPENSEARCH_TIMEOUT", 5))
+OPENSEARCH_RETRIES = int(os.environ.get("OPENSEARCH_RETRIES", 2))
+# Search engine behind /jobs/search/: "opensearch", "postgres", "memory" or a dotted backend class path.
+# With a fallback set, searches fail over to it when the primary raises.
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "opensearch")
+SEARCH_FALLBACK_BACKEND = os.environ.get("SEARCH_FALLBACK_BACKEND", "")
+# Serve /jobs/search/ from a native async view (run under config/asgi.py)
+SEARCH_ASYNC = os.environ.get("SEARCH_ASYNC", "False") == "True"
+SEARCH_MEMORY_SNAPSHOT = os.environ.get("SEARCH_MEMORY_SNAPSHOT", os.path.join(BASE_DIR, 'search_memory.snapshot'))
+# How long the memory backend's change log (deletions) is kept, in seconds
+SEARCH_MEMORY_CHANGE_RETENTION = float(os.environ.get("SEARCH_MEMORY_CHANGE_RETENTION", 86400))
+SEARCH_INDEX_REPLICAS = int(os.environ.get("SEARCH_INDEX_REPLICAS", 1))
+SEARCH_OUTBOX_BATCH_SIZE = int(os.environ.get("SEARCH_OUTBOX_BATCH_SIZE", 500))
+SEARCH_OUTBOX_POLL_INTERVAL = float(os.environ.get("SEARCH_OUTBOX_POLL_INTERVAL", 1.0))
+SEARCH_OUTBOX_BACKOFF_MAX = float(os.environ.get("SEARCH_OUTBOX_BACKOFF_MAX", 300))
+SEARCH_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("SEARCH_OUTBOX_MAX_ATTEMPTS", 10))
+SEARCH_OUTBOX_CLAIM_TIMEOUT = float(os.environ.get("SEARCH_OUTBOX_CLAIM_TIMEOUT", 120))
+# In-process response cache for public job reads, invalidated by a generation counter bumped on job writes
+JOB_CACHE_ENABLED = os.environ.get("JOB_CACHE_ENABLED", "True") == "True"
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get("JOB_CACHE_MAX_ENTRIES", 1000))
+JOB_CACHE_TTL = float(os.environ.get("JOB_CACHE_TTL", 300))
+JOB_SEARCH_CACHE_TTL = float(os.environ.get("JOB_SEARCH_CACHE_TTL", 30))
+JOB_CACHE_GENERATION_TTL = float(os.environ.get("JOB_CACHE_GENERATION_TTL", 1.0))
+# Length of the description_snippet field in job list and search responses
+JOB_DESCRIPTION_SNIPPET_LENGTH = int(os.environ.get("JOB_DESCRIPTION_SNIPPET_LENGTH", 160))
 DEBUG = os.environ.get('DJANGO_DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ['*']
@@ -34,6 +63,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'api',
@@ -49,6 +79,20 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request db/opensearch/s3/serialize timing: Server-Timing header and /metrics histograms (see api/timing.py)
+if os.environ.get('SERVER_TIMING', 'True') == 'True':
+    MIDDLEWARE.insert(0, 'api.timing.ServerTimingMiddleware')
+# The header exposes per-request phase timings to any client (e.g. login timing for known vs unknown
+# accounts), so it is only sent in DEBUG unless enabled explicitly; the histograms are recorded either way
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', str(DEBUG)) == 'True'
+# Bearer token Prometheus sends to /metrics; without one the endpoint is only served in DEBUG
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Development aid: count SQL per request and enforce views' query_budget (see api/query_budget.py)
+if os.environ.get('QUERY_BUDGET', 'False') == 'True':
+    MIDDLEWARE.append('api.query_budget.QueryBudgetMiddleware')
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'True') == 'True'
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -71,7 +115,6 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
-print(os.path.join(BASE_DIR, '.env'))
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -127,7 +170,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
 }
 
@@ -136,7 +179,12 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'api.authentication.CachedTokenRefreshSerializer',
 }
+# Per-process cache of authenticated users (see api/authentication.py)
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_USER_CACHE_TTL = float(os.environ.get('AUTH_USER_CACHE_TTL', 300))
+AUTH_USER_GENERATION_TTL = float(os.environ.get('AUTH_USER_GENERATION_TTL', 1.0))
 
 # Custom user model
 AUTH_USER_MODEL = 'api.User'  # Assuming you will create a custom user model in api/models.py
\ No newline at end of file
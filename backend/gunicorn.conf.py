@@ -0,0 +1,21 @@
+import gc
+import os
+
+# gunicorn settings for startup.sh; any of them can be overridden on the command
+# line or through GUNICORN_CMD_ARGS, and the worker count through WEB_CONCURRENCY.
+
+wsgi_app = 'config.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+# Load Django once in the master and fork workers from it: workers start without
+# importing anything and share the loaded code and warm caches copy-on-write.
+# Turn off to get independently loaded workers (e.g. for `--reload` during development).
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before the first fork
+    if server.cfg.preload_app:
+        from api.warmup import warm_up
+        warm_up()
+        # Keep the collector from touching (and so copying) the preloaded objects in every worker
+        gc.freeze()
@@ -1,3 +1,7 @@
 #!/bin/sh
 python manage.py migrate --noinput
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+# Push the jobs changed since the last sync in the background. The full --reconcile pass
+# reads the whole catalog, so it runs on a schedule (see README), not on every boot.
+python manage.py sync_search_index &
+# Settings (bind address, preloading) live in gunicorn.conf.py
+exec gunicorn -c gunicorn.conf.py
@@ -5,6 +5,8 @@ import { useRouter } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
 import { ROLE_ADMIN } from '@/constants/app-constants';
 const API_BASE_URL = process.env.EXPO_PUBLIC_API_URL;
+// Only what a job card shows; the full description is loaded on the detail screen
+const JOB_CARD_FIELDS = 'id,title,company,location,employment_type,description_snippet';
 export default function HomePage() {
   const { user } = useAuth();
   const router = useRouter();
@@ -36,7 +38,7 @@ export default function HomePage() {
     setLoading(true);
     loadingRef.current = true;
     try {
-      const res = await fetch(`${API_BASE_URL}/api/jobs/?page=${pageNum}`);
+      const res = await fetch(`${API_BASE_URL}/api/jobs/?page=${pageNum}&fields=${JOB_CARD_FIELDS}`);
       const data = await res.json();
       if (res.ok) {
         setHasNext(!!data.next);
@@ -75,7 +77,7 @@ export default function HomePage() {
     if (searchTimeout.current) clearTimeout(searchTimeout.current);
     searchTimeout.current = setTimeout(async () => {
       try {
-        const res = await fetch(`${API_BASE_URL}/api/jobs/search/?q=${encodeURIComponent(search.trim())}&page=1&page_size=50`);
+        const res = await fetch(`${API_BASE_URL}/api/jobs/search/?q=${encodeURIComponent(search.trim())}&page=1&page_size=50&fields=${JOB_CARD_FIELDS}`);
         const data = await res.json();
         if (res.ok) {
           setJobs(data.results);
@@ -108,7 +110,7 @@ export default function HomePage() {
         <Text style={styles.jobCompany}>{item.company}</Text>
         <Text style={styles.jobLocation}>{item.location}</Text>
         <Text style={styles.jobType}>{item.employment_type}</Text>
-        <Text numberOfLines={2} style={styles.jobDesc}>{item.description}</Text>
+        <Text numberOfLines={2} style={styles.jobDesc}>{item.description_snippet}</Text>
       </View>
     </TouchableOpacity>
   );
@@ -9,26 +9,41 @@ export default function JobApplicationsPage() {
   const { getValidAccessToken } = useAuth();
   const [applications, setApplications] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Applicants are paginated; `next` is the URL of the following page
+  const fetchPage = async (url: string, reset: boolean) => {
+    try {
+      const token = await getValidAccessToken();
+      const res = await fetch(url, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      const data = await res.json();
+      if (res.ok) {
+        setApplications(prev => (reset ? data.results : [...prev, ...data.results]));
+        setNextUrl(data.next);
+      } else Alert.alert('Error', data.detail || 'Failed to load applications');
+    } catch {
+      Alert.alert('Error', 'Network error');
+    }
+  };
 
   useEffect(() => {
     (async () => {
       setLoading(true);
-      try {
-        const token = await getValidAccessToken();
-        const res = await fetch(`${API_BASE_URL}/api/jobs/${id}/applicants/`, {
-          headers: { Authorization: `Bearer ${token}` },
-        });
-        const data = await res.json();
-        if (res.ok) setApplications(data);
-        else Alert.alert('Error', data.detail || 'Failed to load applications');
-      } catch {
-        Alert.alert('Error', 'Network error');
-      } finally {
-        setLoading(false);
-      }
+      await fetchPage(`${API_BASE_URL}/api/jobs/${id}/applicants/`, true);
+      setLoading(false);
     })();
   }, [id]);
 
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    await fetchPage(nextUrl, false);
+    setLoadingMore(false);
+  };
+
   if (loading) return <ActivityIndicator style={{ flex: 1, marginTop: 40 }} />;
 
   return (
@@ -40,6 +55,9 @@ export default function JobApplicationsPage() {
         <FlatList
           data={applications}
           keyExtractor={item => item.id.toString()}
+          onEndReached={loadMore}
+          onEndReachedThreshold={0.5}
+          ListFooterComponent={loadingMore ? <ActivityIndicator style={{ marginVertical: 16 }} /> : null}
           renderItem={({ item }) => (
             <TouchableOpacity
               style={styles.card}